@@ -1,10 +1,18 @@
+from functools import partial
+
 import numpy as np
+from scipy.linalg import LinAlgError, cho_factor, cho_solve, lstsq
+from scipy.linalg.blas import get_blas_funcs
 
 from ..solvers.in_place import (
     elastic_net_,
     general_plastic_net_,
+    general_plastic_net_covariance_,
+    general_plastic_net_shotgun_,
     hard_plastic_net_,
     lasso_,
+    lasso_multi_,
+    lasso_path_,
     ordinary_least_squares_,
     plastic_lasso_,
     plastic_ridge_,
@@ -14,179 +22,652 @@ from ..solvers.in_place import (
 )
 
 
+def _check_shapes(X, y):
+    r"""Raises a ``ValueError`` unless **X** has shape (N,D) and **y** has shape (N,)."""
+    if X.ndim != 2:
+        raise ValueError("X must be two-dimensional, got shape {}".format(X.shape))
+    if y.shape != (X.shape[0],):
+        raise ValueError(
+            "y must have shape ({},) to match X, got shape {}".format(
+                X.shape[0], y.shape
+            )
+        )
+
+
+def _as_target(value, X, name):
+    r"""Returns the penalty target **value** as an array of the dtype of **X**, or ``None`` if it is ``None``. Raises a ``ValueError`` unless it has shape (D,), since the solvers index it without bounds checks."""
+    if value is None:
+        return None
+    value = np.asarray(value, dtype=X.dtype)
+    if value.shape != (X.shape[1],):
+        raise ValueError(
+            "{} must have shape ({},) to match X, got shape {}".format(
+                name, X.shape[1], value.shape
+            )
+        )
+    return value
+
+
 class Regression:
     r"""
     This class encapsulates a regression problem.
     It stores the data matrix :math:`X` and the target :math:`\vec{y}`, and provides as methods all of the in-place solvers in :mod:`plasticnet.solvers.in_place`.
     It also stores the coefficient vector :math:`\vec{\beta}`, and the penalized regression target vectors :math:`\vec{\xi}` (L1 target) and :math:`\vec{\zeta}` (L2 target).
     Calling any of the ``fit_`` methods below will update :math:`\vec{\beta}` in-place.
+    When :math:`N > D`, the ``fit_`` methods use the covariance updates of :meth:`plasticnet.solvers.in_place.general_plastic_net_covariance_`, reusing :math:`X^T\vec{y}` and the Gram matrix columns it caches across fits.
+    Otherwise :meth:`fit_lasso` and :meth:`fit_elastic_net` first discard features with the strong rules of Tibshirani et al. (2012), and only run coordinate descent over the remaining ones, re-adding any discarded feature that violates the KKT conditions at the solution.
+    Passing ``n_parallel > 1`` to a ``fit_`` method instead runs the parallel coordinate descent of :meth:`plasticnet.solvers.in_place.general_plastic_net_shotgun_`, sweeping that many blocks of coordinates in parallel threads; :meth:`fit_lasso` and :meth:`fit_elastic_net` still apply the strong rules first.
+    :math:`X` is stored in Fortran (column-major) order, so that the columns swept by coordinate descent are contiguous in memory; a C-ordered input is copied once on construction.
 
     Args:
         X (numpy.ndarray): shape (N,D) data matrix.
         y (numpy.ndarray): shape (N,) target vector.
+        dtype (numpy.dtype): floating point precision used to store the data and coefficients. ``numpy.float32`` halves the memory traffic of coordinate descent, at the cost of precision; the ``tol`` passed to the ``fit_`` methods is floored at the resolution of this dtype.
 
     Attributes:
+        X (numpy.ndarray): shape (N,D) data matrix, in Fortran order.
         beta (numpy.ndarray): shape (D,) coefficient vector
-        xi (numpy.ndarray): shape (D,) L1 coefficient target vector
-        zeta (numpy.ndarray): shape (D,) L2 coefficient target vector
+        xi (numpy.ndarray): shape (D,) L1 coefficient target vector, zero unless set
+        zeta (numpy.ndarray): shape (D,) L2 coefficient target vector, zero unless set
+        beta_path (numpy.ndarray): shape (D,L) coefficient vectors from the last call to :meth:`fit_lasso_path`
+        beta_multi (numpy.ndarray): shape (D,T) coefficient vectors from the last call to :meth:`fit_lasso_multi`
     """
 
-    def __init__(self, X, y):
-        self.X = X
-        self.y = y
+    def __init__(self, X, y, dtype=np.float64):
+        self._dtype = np.dtype(dtype)
+        self._tol_floor = np.finfo(dtype).resolution
 
-        N, D = self.X.shape
-        self._beta = np.zeros(D, dtype=np.float64)
-        self._r = self.y - np.dot(self.X, self._beta)
+        self._xi = None
+        self._zeta = None
 
-        self.xi = np.zeros(D, dtype=np.float64)
-        self.zeta = np.zeros(D, dtype=np.float64)
+        self.beta_path = None
+        self.beta_multi = None
 
         self.converged = False
         self.iter_num = 0
 
+        self.set_data(X, y)
+
+    def set_data(self, X, y):
+        r"""Replaces the data matrix :math:`X` and the target :math:`\vec{y}` together, e.g. to change the number of samples. Everything derived from them is rebuilt, and :math:`\vec{\beta}` is reset to zero.
+
+        Args:
+            X (numpy.ndarray): shape (N,D) data matrix.
+            y (numpy.ndarray): shape (N,) target vector.
+
+        Raises:
+            ValueError: if **X** is not two-dimensional, or **y** does not have shape (N,)."""
+        X = np.asfortranarray(X, dtype=self._dtype)
+        y = np.asarray(y, dtype=self._dtype)
+        _check_shapes(X, y)
+        self._X, self._y = X, y
+        self._reset()
+
+    def _reset(self):
+        r"""(Re)builds everything derived from :math:`X` and :math:`\vec{y}`, with :math:`\vec{\beta} = 0`, and binds the in-place solvers to the coefficient, residual and data arrays, so that the ``fit_`` methods only pass the penalty arguments."""
+        N, D = self._X.shape
+        dtype = self._X.dtype
+        self._beta = np.zeros(D, dtype=dtype)
+        self._r = self._y.copy()
+        self._col_sq = np.einsum("ij,ij->j", self._X, self._X)
+        self._gemv = get_blas_funcs("gemv", (self._X,))
+
+        self._use_covariance = N > D
+        self._Xty = self._gemv(1.0, self._X, self._y, trans=1)
+        self._gram = None
+        self._gram_cached = np.zeros(D, dtype=bool)
+
+        if self._xi is not None and self._xi.shape != (D,):
+            self._xi = None
+        if self._zeta is not None and self._zeta.shape != (D,):
+            self._zeta = None
+
+        bound = (self._beta, self._r, self._X)
+        col_sq = self._col_sq
+        self._ordinary_least_squares = partial(
+            ordinary_least_squares_, *bound, col_sq=col_sq
+        )
+        self._ridge = partial(ridge_, *bound, col_sq=col_sq)
+        self._lasso_path = partial(lasso_path_, *bound, col_sq=col_sq)
+        self._general_plastic_net = partial(general_plastic_net_, *bound, col_sq=col_sq)
+        self._general_plastic_net_covariance = partial(
+            general_plastic_net_covariance_, *bound, col_sq=col_sq
+        )
+        self._general_plastic_net_shotgun = partial(
+            general_plastic_net_shotgun_, *bound, col_sq=col_sq
+        )
+        self._plastic_ridge = partial(plastic_ridge_, *bound, col_sq=col_sq)
+        self._plastic_lasso = partial(plastic_lasso_, *bound, col_sq=col_sq)
+        self._hard_plastic_net = partial(hard_plastic_net_, *bound, col_sq=col_sq)
+        self._soft_plastic_net = partial(soft_plastic_net_, *bound, col_sq=col_sq)
+        self._unified_plastic_net = partial(unified_plastic_net_, *bound, col_sq=col_sq)
+
+    @property
+    def X(self):
+        r"""X is a property because everything the solvers reuse (column norms, :math:`X^T\vec{y}`, the Gram matrix and the bound solvers) is derived from it. Assigning a new :math:`X` rebuilds that state and resets :math:`\vec{\beta}` to zero. The new :math:`X` must have the same number of rows as :math:`\vec{y}`; use :meth:`set_data` to change both."""
+        return self._X
+
+    @X.setter
+    def X(self, value):
+        self.set_data(value, self._y)
+
+    @property
+    def y(self):
+        r"""y is a property because :math:`X^T\vec{y}` and :math:`\vec{r}` are derived from it. Assigning a new :math:`\vec{y}` of the same length resets :math:`\vec{\beta}` to zero and :math:`\vec{r}` to :math:`\vec{y}`, and recomputes :math:`X^T\vec{y}`; the column norms and Gram matrix only depend on :math:`X` and are kept. Use :meth:`set_data` to change the number of samples."""
+        return self._y
+
+    @y.setter
+    def y(self, value):
+        value = np.asarray(value, dtype=self._dtype)
+        _check_shapes(self._X, value)
+        self._y = value
+        self._beta[:] = 0.0
+        np.copyto(self._r, value)
+        self._Xty = self._gemv(1.0, self._X, value, trans=1)
+
     @property
     def beta(self):
-        r"""beta is a property becasue when setting :math:`\vec{\beta}` you also need to set :math:`\vec{r}` such that :math:`\vec{r} = \vec{y} - X\vec{\beta}`. Via the property implementation you can transparently get and set it like a normal attribute."""
+        r"""beta is a property becasue when setting :math:`\vec{\beta}` you also need to set :math:`\vec{r}` such that :math:`\vec{r} = \vec{y} - X\vec{\beta}`. Via the property implementation you can transparently get and set it like a normal attribute.
+        The returned array is the buffer the solvers update in place, so it must not be modified in place: assign a new value instead (e.g. ``reg.beta = new_beta``), or :math:`\vec{r}` goes out of sync with it."""
         return self._beta
 
     @beta.setter
     def beta(self, value):
-        r"""Sets :math:`\vec{\beta}` to desired value while also updating the residual vector via :math:`\vec{r} = \vec{y} - X\vec{\beta}`."""
-        self._beta = value
-        self._r = self.y - np.dot(self.X, value)
+        r"""Sets :math:`\vec{\beta}` to desired value while also updating the residual vector via :math:`\vec{r} = \vec{y} - X\vec{\beta}`.
+        When only a few coefficients change (e.g. warm starts), only the corresponding columns of :math:`X` are used to update :math:`\vec{r}`; this relies on :math:`\vec{r}` being in sync with the current :math:`\vec{\beta}`, which is why in-place edits of ``beta`` are not supported.
+        Both vectors are updated in place, so the solvers always see the same buffers; a dense update accumulates :math:`-X\vec{\beta}` straight into :math:`\vec{r}` with ``gemv``, without a temporary.
+        A value that does not have shape (D,) raises a ``ValueError`` and leaves both vectors untouched."""
+        value = np.asarray(value, dtype=self._beta.dtype)
+        if value.shape != self._beta.shape:
+            raise ValueError(
+                "beta must have shape {}, got shape {}".format(
+                    self._beta.shape, value.shape
+                )
+            )
+        delta = value - self._beta
+        nz = np.flatnonzero(delta)
+        if not np.any(value):
+            np.copyto(self._r, self.y)
+        elif nz.size < 0.1 * delta.size and not np.may_share_memory(value, self._beta):
+            self._r -= np.dot(self.X[:, nz], delta[nz])
+        else:
+            np.copyto(self._r, self.y)
+            self._gemv(-1.0, self.X, value, 1.0, self._r, overwrite_y=True)
+        self._beta[:] = value
+
+    @property
+    def xi(self):
+        r"""xi is a property so that :math:`\vec{\xi}` is only allocated when it is first accessed or set. While it is unset, the plastic ``fit_`` methods treat it as zero and dispatch to the matching non-plastic solver."""
+        if self._xi is None:
+            self._xi = np.zeros(self.X.shape[1], dtype=self.X.dtype)
+        return self._xi
+
+    @xi.setter
+    def xi(self, value):
+        self._xi = _as_target(value, self.X, "xi")
+
+    @property
+    def zeta(self):
+        r"""zeta is a property so that :math:`\vec{\zeta}` is only allocated when it is first accessed or set. While it is unset, the plastic ``fit_`` methods treat it as zero and dispatch to the matching non-plastic solver."""
+        if self._zeta is None:
+            self._zeta = np.zeros(self.X.shape[1], dtype=self.X.dtype)
+        return self._zeta
+
+    @zeta.setter
+    def zeta(self, value):
+        self._zeta = _as_target(value, self.X, "zeta")
 
-    def fit_ordinary_least_squares(self, tol=1e-8, max_iter=1000):
+    def fit_ordinary_least_squares(self, tol=1e-8, max_iter=1000, n_parallel=1):
         r"""In-place ordinary least squares regression.
+        When :math:`N \ge D` and :math:`X` has full column rank, the problem is solved directly with LAPACK ``gelsd`` instead of coordinate descent.
         See :meth:`plasticnet.solvers.in_place.ordinary_least_squares_` for documentation."""
-        self.converged, self.iter_num = ordinary_least_squares_(
-            self._beta, self._r, self.X, tol=tol, max_iter=max_iter
-        )
+        N, D = self.X.shape
+        if N >= D:
+            cond = np.finfo(self.X.dtype).eps * N
+            beta, _, rank, _ = lstsq(self.X, self.y, cond=cond, lapack_driver="gelsd")
+            if rank == D:
+                self.beta = beta
+                self.converged, self.iter_num = True, 0
+                return
+        if n_parallel > 1 or self._use_covariance:
+            self._fit_general(
+                lambda_total=0.0, tol=tol, max_iter=max_iter, n_parallel=n_parallel
+            )
+        else:
+            self.converged, self.iter_num = self._ordinary_least_squares(
+                tol=max(tol, self._tol_floor),
+                max_iter=max_iter,
+            )
 
-    def fit_ridge(self, lambda_total=1.0, tol=1e-8, max_iter=1000):
+    def fit_ridge(
+        self,
+        lambda_total=1.0,
+        tol=1e-8,
+        max_iter=1000,
+        n_parallel=1,
+        direct_max_features=5000,
+    ):
         r"""In-place ridge regression.
+        When :math:`N \ge D`, :math:`D \le` **direct_max_features** and :math:`\lambda > 0`, the normal equations :math:`(X^TX + N\lambda I)\vec{\beta} = X^T\vec{y}` are solved directly by Cholesky factorization instead of coordinate descent.
+        :math:`X^TX` is computed once with ``syrk`` and kept for later fits.
+        If the factorization fails, e.g. for rank deficient :math:`X` and a penalty too small to make the system numerically positive definite, coordinate descent is used instead.
         See :meth:`plasticnet.solvers.in_place.ridge_` for documentation."""
-        self.converged, self.iter_num = ridge_(
-            self._beta,
-            self._r,
-            self.X,
-            lambda_total=lambda_total,
-            tol=tol,
-            max_iter=max_iter,
-        )
+        N, D = self.X.shape
+        if N >= D and D <= direct_max_features and lambda_total > 0.0:
+            gram = self._full_gram() + N * lambda_total * np.eye(D, dtype=self.X.dtype)
+            try:
+                self.beta = cho_solve(cho_factor(gram, overwrite_a=True), self._Xty)
+            except LinAlgError:
+                pass
+            else:
+                self.converged, self.iter_num = True, 0
+                return
+        if n_parallel > 1 or self._use_covariance:
+            self._fit_general(
+                lambda_total=lambda_total,
+                alpha=0.0,
+                tol=tol,
+                max_iter=max_iter,
+                n_parallel=n_parallel,
+            )
+        else:
+            self.converged, self.iter_num = self._ridge(
+                lambda_total=lambda_total,
+                tol=max(tol, self._tol_floor),
+                max_iter=max_iter,
+            )
 
-    def fit_lasso(self, lambda_total=1.0, tol=1e-8, max_iter=1000):
+    def fit_lasso(self, lambda_total=1.0, tol=1e-8, max_iter=1000, n_parallel=1):
         r"""In-place lasso regression.
         See :meth:`plasticnet.solvers.in_place.lasso_` for documentation."""
-        self.converged, self.iter_num = lasso_(
-            self._beta,
-            self._r,
-            self.X,
-            lambda_total=lambda_total,
-            tol=tol,
+        if n_parallel > 1:
+            self._fit_screened(
+                general_plastic_net_shotgun_,
+                lambda_total,
+                tol=tol,
+                max_iter=max_iter,
+                xi=None,
+                zeta=None,
+                lambda_total=lambda_total,
+                alpha=1.0,
+                n_parallel=n_parallel,
+            )
+        elif self._use_covariance:
+            self._fit_general(
+                lambda_total=lambda_total, alpha=1.0, tol=tol, max_iter=max_iter
+            )
+        else:
+            self._fit_screened(
+                lasso_,
+                lambda_total,
+                tol=tol,
+                max_iter=max_iter,
+                lambda_total=lambda_total,
+            )
+
+    def fit_lasso_path(self, lambdas, tol=1e-8, max_iter=1000, warm_start=True):
+        r"""In-place lasso regularization path, stored in ``beta_path``. :math:`\vec{\beta}` is left at the solution for the last penalty fit, i.e. the smallest one.
+        ``converged`` is whether every fit along the path converged, and ``iter_num`` is the total number of iterations.
+        See :meth:`plasticnet.solvers.in_place.lasso_path_` for documentation."""
+        self.beta_path, iter_nums, converged = self._lasso_path(
+            np.asarray(lambdas, dtype=np.float64),
+            tol=max(tol, self._tol_floor),
             max_iter=max_iter,
+            warm_start=warm_start,
         )
+        self.converged = bool(np.all(converged))
+        self.iter_num = int(np.sum(iter_nums))
 
-    def fit_elastic_net(self, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000):
-        r"""In-place elastic net regression.
-        See :meth:`plasticnet.solvers.in_place.elastic_net_` for documentation."""
-        self.converged, self.iter_num = elastic_net_(
-            self._beta,
-            self._r,
+    def fit_lasso_multi(self, Y, lambda_total=1.0, tol=1e-8, max_iter=1000):
+        r"""Lasso regression of each column of the shape (N,T) target matrix **Y** on :math:`X`, stored in ``beta_multi``. :math:`\vec{\beta}` and :math:`\vec{y}` are left untouched.
+        A shape (N,) **Y** is treated as a single target, i.e. as shape (N,1).
+        See :meth:`plasticnet.solvers.in_place.lasso_multi_` for documentation."""
+        R = np.array(Y, dtype=self.X.dtype, order="C", ndmin=2)
+        if np.ndim(Y) == 1:
+            R = R.T.copy()
+        if R.ndim != 2 or R.shape[0] != self.X.shape[0]:
+            raise ValueError(
+                "Y must have shape (N,) or (N,T) with N = {}, got shape {}".format(
+                    self.X.shape[0], np.shape(Y)
+                )
+            )
+        self.beta_multi = np.zeros((self.X.shape[1], R.shape[1]), dtype=self.X.dtype)
+        self.converged, self.iter_num = lasso_multi_(
+            self.beta_multi,
+            R,
             self.X,
             lambda_total=lambda_total,
-            alpha=alpha,
-            tol=tol,
+            tol=max(tol, self._tol_floor),
             max_iter=max_iter,
+            col_sq=self._col_sq,
         )
 
+    def fit_elastic_net(
+        self, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000, n_parallel=1
+    ):
+        r"""In-place elastic net regression.
+        See :meth:`plasticnet.solvers.in_place.elastic_net_` for documentation."""
+        if n_parallel > 1:
+            self._fit_screened(
+                general_plastic_net_shotgun_,
+                alpha * lambda_total,
+                tol=tol,
+                max_iter=max_iter,
+                xi=None,
+                zeta=None,
+                lambda_total=lambda_total,
+                alpha=alpha,
+                n_parallel=n_parallel,
+            )
+        elif self._use_covariance:
+            self._fit_general(
+                lambda_total=lambda_total, alpha=alpha, tol=tol, max_iter=max_iter
+            )
+        else:
+            self._fit_screened(
+                elastic_net_,
+                alpha * lambda_total,
+                tol=tol,
+                max_iter=max_iter,
+                lambda_total=lambda_total,
+                alpha=alpha,
+            )
+
     def fit_general_plastic_net(
-        self, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000
+        self, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000, n_parallel=1
     ):
         r"""In-place general plastic net regression.
         See :meth:`plasticnet.solvers.in_place.general_plastic_net_` for documentation."""
-        self.converged, self.iter_num = general_plastic_net_(
-            self._beta,
-            self._r,
-            self.X,
-            self.xi,
-            self.zeta,
-            lambda_total=lambda_total,
-            alpha=alpha,
-            tol=tol,
-            max_iter=max_iter,
-        )
+        if self._xi is None and self._zeta is None:
+            self.fit_elastic_net(
+                lambda_total=lambda_total,
+                alpha=alpha,
+                tol=tol,
+                max_iter=max_iter,
+                n_parallel=n_parallel,
+            )
+            return
+        if n_parallel > 1 or self._use_covariance:
+            self._fit_general(
+                xi=self._xi,
+                zeta=self._zeta,
+                lambda_total=lambda_total,
+                alpha=alpha,
+                tol=tol,
+                max_iter=max_iter,
+                n_parallel=n_parallel,
+            )
+        else:
+            self.converged, self.iter_num = self._general_plastic_net(
+                self._xi,
+                self._zeta,
+                lambda_total=lambda_total,
+                alpha=alpha,
+                tol=max(tol, self._tol_floor),
+                max_iter=max_iter,
+            )
 
-    def fit_plastic_ridge(self, lambda_total=1.0, tol=1e-8, max_iter=1000):
+    def fit_plastic_ridge(
+        self, lambda_total=1.0, tol=1e-8, max_iter=1000, n_parallel=1
+    ):
         r"""In-place plastic ridge regression.
         See :meth:`plasticnet.solvers.in_place.plastic_ridge_` for documentation."""
-        self.converged, self.iter_num = plastic_ridge_(
-            self._beta,
-            self._r,
-            self.X,
-            self.zeta,
-            lambda_total=lambda_total,
-            tol=tol,
-            max_iter=max_iter,
-        )
+        if self._zeta is None:
+            self.fit_ridge(
+                lambda_total=lambda_total,
+                tol=tol,
+                max_iter=max_iter,
+                n_parallel=n_parallel,
+            )
+            return
+        if n_parallel > 1 or self._use_covariance:
+            self._fit_general(
+                zeta=self._zeta,
+                lambda_total=lambda_total,
+                alpha=0.0,
+                tol=tol,
+                max_iter=max_iter,
+                n_parallel=n_parallel,
+            )
+        else:
+            self.converged, self.iter_num = self._plastic_ridge(
+                self._zeta,
+                lambda_total=lambda_total,
+                tol=max(tol, self._tol_floor),
+                max_iter=max_iter,
+            )
 
-    def fit_plastic_lasso(self, lambda_total=1.0, tol=1e-8, max_iter=1000):
+    def fit_plastic_lasso(
+        self, lambda_total=1.0, tol=1e-8, max_iter=1000, n_parallel=1
+    ):
         r"""In-place plastic lasso regression.
         See :meth:`plasticnet.solvers.in_place.plastic_lasso_` for documentation."""
-        self.converged, self.iter_num = plastic_lasso_(
-            self._beta,
-            self._r,
-            self.X,
-            self.xi,
-            lambda_total=lambda_total,
-            tol=tol,
-            max_iter=max_iter,
-        )
+        if self._xi is None:
+            self.fit_lasso(
+                lambda_total=lambda_total,
+                tol=tol,
+                max_iter=max_iter,
+                n_parallel=n_parallel,
+            )
+            return
+        if n_parallel > 1 or self._use_covariance:
+            self._fit_general(
+                xi=self._xi,
+                lambda_total=lambda_total,
+                alpha=1.0,
+                tol=tol,
+                max_iter=max_iter,
+                n_parallel=n_parallel,
+            )
+        else:
+            self.converged, self.iter_num = self._plastic_lasso(
+                self._xi,
+                lambda_total=lambda_total,
+                tol=max(tol, self._tol_floor),
+                max_iter=max_iter,
+            )
 
     def fit_hard_plastic_net(
-        self, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000
+        self, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000, n_parallel=1
     ):
         r"""In-place hard plastic net regression.
         See :meth:`plasticnet.solvers.in_place.hard_plastic_net_` for documentation."""
-        self.converged, self.iter_num = hard_plastic_net_(
-            self._beta,
-            self._r,
-            self.X,
-            self.xi,
-            lambda_total=lambda_total,
-            alpha=alpha,
-            tol=tol,
-            max_iter=max_iter,
-        )
+        if self._xi is None:
+            self.fit_elastic_net(
+                lambda_total=lambda_total,
+                alpha=alpha,
+                tol=tol,
+                max_iter=max_iter,
+                n_parallel=n_parallel,
+            )
+            return
+        if n_parallel > 1 or self._use_covariance:
+            self._fit_general(
+                xi=self._xi,
+                lambda_total=lambda_total,
+                alpha=alpha,
+                tol=tol,
+                max_iter=max_iter,
+                n_parallel=n_parallel,
+            )
+        else:
+            self.converged, self.iter_num = self._hard_plastic_net(
+                self._xi,
+                lambda_total=lambda_total,
+                alpha=alpha,
+                tol=max(tol, self._tol_floor),
+                max_iter=max_iter,
+            )
 
     def fit_soft_plastic_net(
-        self, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000
+        self, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000, n_parallel=1
     ):
         r"""In-place sof t plastic net regression.
         See :meth:`plasticnet.solvers.in_place.soft_plastic_net_` for documentation."""
-        self.converged, self.iter_num = soft_plastic_net_(
-            self._beta,
-            self._r,
-            self.X,
-            self.zeta,
-            lambda_total=lambda_total,
-            alpha=alpha,
-            tol=tol,
-            max_iter=max_iter,
-        )
+        if self._zeta is None:
+            self.fit_elastic_net(
+                lambda_total=lambda_total,
+                alpha=alpha,
+                tol=tol,
+                max_iter=max_iter,
+                n_parallel=n_parallel,
+            )
+            return
+        if n_parallel > 1 or self._use_covariance:
+            self._fit_general(
+                zeta=self._zeta,
+                lambda_total=lambda_total,
+                alpha=alpha,
+                tol=tol,
+                max_iter=max_iter,
+                n_parallel=n_parallel,
+            )
+        else:
+            self.converged, self.iter_num = self._soft_plastic_net(
+                self._zeta,
+                lambda_total=lambda_total,
+                alpha=alpha,
+                tol=max(tol, self._tol_floor),
+                max_iter=max_iter,
+            )
 
     def fit_unified_plastic_net(
-        self, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000
+        self, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000, n_parallel=1
     ):
         r"""In-place unified plastic net regression.
         See :meth:`plasticnet.solvers.in_place.unified_plastic_net_` for documentation."""
-        self.converged, self.iter_num = unified_plastic_net_(
-            self._beta,
-            self._r,
-            self.X,
-            self.xi,
+        if self._xi is None:
+            self.fit_elastic_net(
+                lambda_total=lambda_total,
+                alpha=alpha,
+                tol=tol,
+                max_iter=max_iter,
+                n_parallel=n_parallel,
+            )
+            return
+        if n_parallel > 1 or self._use_covariance:
+            self._fit_general(
+                xi=self._xi,
+                zeta=self._xi,
+                lambda_total=lambda_total,
+                alpha=alpha,
+                tol=tol,
+                max_iter=max_iter,
+                n_parallel=n_parallel,
+            )
+        else:
+            self.converged, self.iter_num = self._unified_plastic_net(
+                self._xi,
+                lambda_total=lambda_total,
+                alpha=alpha,
+                tol=max(tol, self._tol_floor),
+                max_iter=max_iter,
+            )
+
+    def _full_gram(self):
+        r"""Returns the full Gram matrix :math:`X^TX`, computing it with ``syrk`` if any of its columns are not yet cached. It shares its buffer with the covariance updates of :meth:`_fit_general`."""
+        D = self.X.shape[1]
+        if self._gram is None:
+            self._gram = np.empty((D, D), dtype=self.X.dtype)
+        if not self._gram_cached.all():
+            syrk = get_blas_funcs("syrk", (self.X,))
+            upper = syrk(1.0, self.X, trans=1)
+            np.copyto(self._gram, np.triu(upper) + np.triu(upper, 1).T)
+            self._gram_cached[:] = True
+        return self._gram
+
+    def _fit_general(
+        self,
+        xi=None,
+        zeta=None,
+        lambda_total=1.0,
+        alpha=1.0,
+        tol=1e-8,
+        max_iter=1000,
+        n_parallel=1,
+        residual_sweeps=10,
+    ):
+        r"""Dispatches to :meth:`plasticnet.solvers.in_place.general_plastic_net_shotgun_` if ``n_parallel > 1`` and to :meth:`plasticnet.solvers.in_place.general_plastic_net_covariance_` otherwise, with ``None`` standing in for a zero **xi** or **zeta**, which the kernels never load.
+        A Gram row costs as much as a whole residual sweep, so unless the rows for the current support are already cached, up to **residual_sweeps** sweeps of :meth:`plasticnet.solvers.in_place.general_plastic_net_` are run first, screened by :meth:`_fit_screened` when **xi** and **zeta** are zero.
+        Well-conditioned fits usually converge within them, and otherwise the covariance updates only compute rows for the features that are still active."""
+        D = self.X.shape[1]
+        if n_parallel > 1:
+            self.converged, self.iter_num = self._general_plastic_net_shotgun(
+                xi,
+                zeta,
+                lambda_total=lambda_total,
+                alpha=alpha,
+                tol=max(tol, self._tol_floor),
+                max_iter=max_iter,
+                n_parallel=n_parallel,
+            )
+            return
+        self.iter_num = 0
+        support = self._beta != 0
+        if not np.any(support) or not np.all(self._gram_cached[support]):
+            if xi is None and zeta is None:
+                self._fit_screened(
+                    general_plastic_net_,
+                    alpha * lambda_total,
+                    tol=tol,
+                    max_iter=min(max_iter, residual_sweeps),
+                    xi=None,
+                    zeta=None,
+                    lambda_total=lambda_total,
+                    alpha=alpha,
+                )
+            else:
+                self.converged, self.iter_num = self._general_plastic_net(
+                    xi,
+                    zeta,
+                    lambda_total=lambda_total,
+                    alpha=alpha,
+                    tol=max(tol, self._tol_floor),
+                    max_iter=min(max_iter, residual_sweeps),
+                )
+            if self.converged or self.iter_num >= max_iter:
+                return
+        if self._gram is None:
+            self._gram = np.empty((D, D), dtype=self.X.dtype)
+        converged, iter_num = self._general_plastic_net_covariance(
+            xi,
+            zeta,
+            self._Xty,
+            self._gram,
+            self._gram_cached,
             lambda_total=lambda_total,
             alpha=alpha,
-            tol=tol,
-            max_iter=max_iter,
+            tol=max(tol, self._tol_floor),
+            max_iter=max_iter - self.iter_num,
         )
+        self.converged = converged
+        self.iter_num += iter_num
+
+    def _fit_screened(self, solver, lambda1, tol=1e-8, max_iter=1000, **penalty):
+        r"""Runs **solver** over the features that survive the strong rule for L1 penalty **lambda1**, growing the active set until no discarded feature violates the KKT conditions :math:`|X_{:,j}^T\vec{r}| / N \le \lambda_1`."""
+        N = self.X.shape[0]
+        c = np.abs(self._gemv(1.0, self.X, self._r, trans=1)) / N
+        active = (c >= 2 * lambda1 - np.max(c)) | (self._beta != 0)
+
+        self.converged, self.iter_num = True, 0
+        while True:
+            A = np.flatnonzero(active)
+            if A.size > 0:
+                beta_A = self._beta[A]
+                converged, iter_num = solver(
+                    beta_A,
+                    self._r,
+                    np.asfortranarray(self.X[:, A]),
+                    tol=max(tol, self._tol_floor),
+                    max_iter=max_iter,
+                    col_sq=self._col_sq[A],
+                    **penalty
+                )
+                self._beta[A] = beta_A
+                self.converged = converged
+                self.iter_num += iter_num
+            c = np.abs(self._gemv(1.0, self.X, self._r, trans=1)) / N
+            violations = ~active & (c > lambda1)
+            if not np.any(violations):
+                break
+            active |= violations
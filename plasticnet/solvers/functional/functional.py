@@ -32,11 +32,13 @@ def ordinary_least_squares(X, y, tol=1e-8, max_iter=1000):
         (numpy.ndarray): shape (D,) coefficient vector.
     """
 
+    X = np.asfortranarray(X)
     N, D = X.shape
     beta = np.zeros(D, dtype=np.float64)
     r = y - np.dot(X, beta)
+    col_sq = np.einsum("ij,ij->j", X, X)
 
-    ordinary_least_squares_(beta, r, X, tol=tol, max_iter=max_iter)
+    ordinary_least_squares_(beta, r, X, tol=tol, max_iter=max_iter, col_sq=col_sq)
 
     return beta
 
@@ -60,11 +62,15 @@ def ridge(X, y, lambda_total=1.0, tol=1e-8, max_iter=1000):
         (numpy.ndarray): shape (D,) coefficient vector.
     """
 
+    X = np.asfortranarray(X)
     N, D = X.shape
     beta = np.zeros(D, dtype=np.float64)
     r = y - np.dot(X, beta)
+    col_sq = np.einsum("ij,ij->j", X, X)
 
-    ridge_(beta, r, X, lambda_total=lambda_total, tol=tol, max_iter=max_iter)
+    ridge_(
+        beta, r, X, lambda_total=lambda_total, tol=tol, max_iter=max_iter, col_sq=col_sq
+    )
 
     return beta
 
@@ -88,11 +94,15 @@ def lasso(X, y, lambda_total=1.0, tol=1e-8, max_iter=1000):
         (numpy.ndarray): shape (D,) coefficient vector.
     """
 
+    X = np.asfortranarray(X)
     N, D = X.shape
     beta = np.zeros(D, dtype=np.float64)
     r = y - np.dot(X, beta)
+    col_sq = np.einsum("ij,ij->j", X, X)
 
-    lasso_(beta, r, X, lambda_total=lambda_total, tol=tol, max_iter=max_iter)
+    lasso_(
+        beta, r, X, lambda_total=lambda_total, tol=tol, max_iter=max_iter, col_sq=col_sq
+    )
 
     return beta
 
@@ -117,12 +127,21 @@ def elastic_net(X, y, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000):
         (numpy.ndarray): shape (D,) coefficient vector.
     """
 
+    X = np.asfortranarray(X)
     N, D = X.shape
     beta = np.zeros(D, dtype=np.float64)
     r = y - np.dot(X, beta)
+    col_sq = np.einsum("ij,ij->j", X, X)
 
     elastic_net_(
-        beta, r, X, lambda_total=lambda_total, alpha=alpha, tol=tol, max_iter=max_iter
+        beta,
+        r,
+        X,
+        lambda_total=lambda_total,
+        alpha=alpha,
+        tol=tol,
+        max_iter=max_iter,
+        col_sq=col_sq,
     )
 
     return beta
@@ -152,9 +171,11 @@ def general_plastic_net(
         (numpy.ndarray): shape (D,) coefficient vector.
     """
 
+    X = np.asfortranarray(X)
     N, D = X.shape
     beta = np.zeros(D, dtype=np.float64)
     r = y - np.dot(X, beta)
+    col_sq = np.einsum("ij,ij->j", X, X)
 
     general_plastic_net_(
         beta,
@@ -166,6 +187,7 @@ def general_plastic_net(
         alpha=alpha,
         tol=tol,
         max_iter=max_iter,
+        col_sq=col_sq,
     )
 
     return beta
@@ -191,12 +213,21 @@ def plastic_ridge(X, y, zeta, lambda_total=1.0, tol=1e-8, max_iter=1000):
         (numpy.ndarray): shape (D,) coefficient vector.
     """
 
+    X = np.asfortranarray(X)
     N, D = X.shape
     beta = np.zeros(D, dtype=np.float64)
     r = y - np.dot(X, beta)
+    col_sq = np.einsum("ij,ij->j", X, X)
 
     plastic_ridge_(
-        beta, r, X, zeta, lambda_total=lambda_total, tol=tol, max_iter=max_iter
+        beta,
+        r,
+        X,
+        zeta,
+        lambda_total=lambda_total,
+        tol=tol,
+        max_iter=max_iter,
+        col_sq=col_sq,
     )
 
     return beta
@@ -222,12 +253,21 @@ def plastic_lasso(X, y, xi, lambda_total=1.0, tol=1e-8, max_iter=1000):
         (numpy.ndarray): shape (D,) coefficient vector.
     """
 
+    X = np.asfortranarray(X)
     N, D = X.shape
     beta = np.zeros(D, dtype=np.float64)
     r = y - np.dot(X, beta)
+    col_sq = np.einsum("ij,ij->j", X, X)
 
     plastic_lasso_(
-        beta, r, X, xi, lambda_total=lambda_total, tol=tol, max_iter=max_iter
+        beta,
+        r,
+        X,
+        xi,
+        lambda_total=lambda_total,
+        tol=tol,
+        max_iter=max_iter,
+        col_sq=col_sq,
     )
 
     return beta
@@ -254,9 +294,11 @@ def hard_plastic_net(X, y, xi, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=
         (numpy.ndarray): shape (D,) coefficient vector.
     """
 
+    X = np.asfortranarray(X)
     N, D = X.shape
     beta = np.zeros(D, dtype=np.float64)
     r = y - np.dot(X, beta)
+    col_sq = np.einsum("ij,ij->j", X, X)
 
     hard_plastic_net_(
         beta,
@@ -267,6 +309,7 @@ def hard_plastic_net(X, y, xi, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=
         alpha=alpha,
         tol=tol,
         max_iter=max_iter,
+        col_sq=col_sq,
     )
 
     return beta
@@ -292,9 +335,11 @@ def soft_plastic_net(X, y, zeta, lambda_total=1.0, alpha=0.75, tol=1e-8, max_ite
         (numpy.ndarray): shape (D,) coefficient vector.
     """
 
+    X = np.asfortranarray(X)
     N, D = X.shape
     beta = np.zeros(D, dtype=np.float64)
     r = y - np.dot(X, beta)
+    col_sq = np.einsum("ij,ij->j", X, X)
 
     soft_plastic_net_(
         beta,
@@ -305,6 +350,7 @@ def soft_plastic_net(X, y, zeta, lambda_total=1.0, alpha=0.75, tol=1e-8, max_ite
         alpha=alpha,
         tol=tol,
         max_iter=max_iter,
+        col_sq=col_sq,
     )
 
     return beta
@@ -332,9 +378,11 @@ def unified_plastic_net(
         (numpy.ndarray): shape (D,) coefficient vector.
     """
 
+    X = np.asfortranarray(X)
     N, D = X.shape
     beta = np.zeros(D, dtype=np.float64)
     r = y - np.dot(X, beta)
+    col_sq = np.einsum("ij,ij->j", X, X)
 
     unified_plastic_net_(
         beta,
@@ -345,6 +393,7 @@ def unified_plastic_net(
         alpha=alpha,
         tol=tol,
         max_iter=max_iter,
+        col_sq=col_sq,
     )
 
     return beta
@@ -2,8 +2,12 @@ from .in_place import (
     ordinary_least_squares_,
     ridge_,
     lasso_,
+    lasso_path_,
+    lasso_multi_,
     elastic_net_,
     general_plastic_net_,
+    general_plastic_net_covariance_,
+    general_plastic_net_shotgun_,
     plastic_ridge_,
     plastic_lasso_,
     hard_plastic_net_,
@@ -15,8 +19,12 @@ __all__ = [
     "ordinary_least_squares_",
     "ridge_",
     "lasso_",
+    "lasso_path_",
+    "lasso_multi_",
     "elastic_net_",
     "general_plastic_net_",
+    "general_plastic_net_covariance_",
+    "general_plastic_net_shotgun_",
     "plastic_ridge_",
     "plastic_lasso_",
     "hard_plastic_net_",
@@ -1,13 +1,64 @@
 import numpy as np
-from numba import jit
+from numba import jit, prange
 
 from ...utils import math
 
 
+@jit(nopython=True, nogil=True, cache=True)  # pragma: no cover
+def _col_norm_sq(N, D, col_sq):
+    r"""Scaled squared column norms :math:`||X_{:,j}||_2^2 / N`. Zero columns never move the residual, so they keep the standardized value of one."""
+    if col_sq is None:
+        return np.ones(D, dtype=np.float64)
+    norm_sq = col_sq.astype(np.float64) / N
+    norm_sq[norm_sq == 0.0] = 1.0
+    return norm_sq
+
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)  # pragma: no cover
+def _axpy(a, x, y):
+    r"""In-place :math:`\vec{y} \mathrel{+}= a\vec{x}`, without the temporary array that ``y += a * x`` allocates. ``fastmath`` lets LLVM vectorize the loop with fused multiply-adds; each element is still updated independently, so no reassociation takes place."""
+    for i in range(y.shape[0]):
+        y[i] += a * x[i]
+
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)  # pragma: no cover
+def _dot(x, y):
+    r""":math:`\vec{x} \cdot \vec{y}` as a plain loop, for use inside parallel regions where calling into a (possibly multithreaded) BLAS would oversubscribe the cores. ``fastmath`` lets LLVM vectorize the reduction."""
+    s = 0.0
+    for i in range(x.shape[0]):
+        s += x[i] * y[i]
+    return s
+
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)  # pragma: no cover
+def _axpy_dot(a, x, y, z):
+    r"""In-place :math:`\vec{y} \mathrel{+}= a\vec{x}`, returning :math:`\vec{z} \cdot \vec{y}` for the updated :math:`\vec{y}`. Fusing the residual update with the next coordinate's inner product streams :math:`\vec{y}` through memory once instead of twice."""
+    s = 0.0
+    for i in range(y.shape[0]):
+        y[i] += a * x[i]
+        s += z[i] * y[i]
+    return s
+
+
+@jit(nopython=True, nogil=True, cache=True)  # pragma: no cover
+def _plastic_update(beta_j, rho_j, norm_sq_j, lambda1, lambda2, xi, zeta, j):
+    r"""Coordinate update of the general plastic net for coordinate **j**, with ``None`` standing in for a zero **xi** or **zeta**. Numba compiles a separate version for ``None`` arguments with those branches removed, so a zero target is never loaded."""
+    z = norm_sq_j * beta_j + rho_j
+    if zeta is not None:
+        z += lambda2 * zeta[j]
+    if xi is None:
+        return math.soft_thresh(lambda1, z) / (norm_sq_j + lambda2)
+    return (
+        math.soft_thresh(lambda1, z - (norm_sq_j + lambda2) * xi[j])
+        / (norm_sq_j + lambda2)
+        + xi[j]
+    )
+
+
 @jit(nopython=True, nogil=True, cache=False)  # pragma: no cover
-def ordinary_least_squares_(beta, r, X, tol=1e-8, max_iter=1000):
+def ordinary_least_squares_(beta, r, X, tol=1e-8, max_iter=1000, col_sq=None):
     r"""
-    ordinary_least_squares_(beta, r, X, tol=1e-8, max_iter=1000)
+    ordinary_least_squares_(beta, r, X, tol=1e-8, max_iter=1000, col_sq=None)
 
     Ordinary least squares regression.  This function finds the :math:`\vec{\beta}` that minimizes
 
@@ -21,13 +72,17 @@ def ordinary_least_squares_(beta, r, X, tol=1e-8, max_iter=1000):
         X (numpy.ndarray): shape (N,D) data matrix.
         tol (float): convergence criterion for coordinate descent. coordinate descent runs until the maximum element-wise change in **beta** is less than **tol**.
         max_iter (int): maximum number of update passes through all P elements of **beta**, in case **tol** is never met.
+        col_sq (numpy.ndarray): shape (D,) squared column norms :math:`||X_{:,j}||_2^2`. if ``None``, the columns of **X** are assumed to be standardized, i.e. :math:`||X_{:,j}||_2^2 = N`.
 
     Note
         **beta** and **r** are modified in-place.  As inputs, if :math:`\vec{\beta} = 0`, then it *must* be the case that :math:`\vec{r} = \vec{y}`, or the function will not converge to the correct answer.  In general, the inputs **beta** and **r** must be coordinated such that :math:`\vec{r} = \vec{y} - X\vec{\beta}`.
     """
 
     N, D = X.shape
-    rho = np.ones(D, dtype=np.float64) + tol
+    norm_sq = _col_norm_sq(N, D, col_sq)
+    rho = np.full(D, 1.0 + tol, dtype=beta.dtype)
+
+    dot = np.dot(X[:, 0], r)
 
     iter_num = 0
     converged = False
@@ -35,17 +90,21 @@ def ordinary_least_squares_(beta, r, X, tol=1e-8, max_iter=1000):
     while not converged and iter_num < max_iter:
         iter_num += 1
         for j in range(D):
-            rho[j] = np.dot(X[:, j], r) / N
-            r -= rho[j] * X[:, j]
+            rho[j] = dot / (N * norm_sq[j])
+            next_j = j + 1 if j + 1 < D else 0
+            if rho[j] != 0.0:
+                dot = _axpy_dot(-rho[j], X[:, j], r, X[:, next_j])
+            else:
+                dot = np.dot(X[:, next_j], r)
             beta[j] += rho[j]
         converged = np.max(np.abs(rho)) < tol
     return (converged, iter_num)
 
 
 @jit(nopython=True, nogil=True, cache=True)  # pragma: no cover
-def ridge_(beta, r, X, lambda_total=1.0, tol=1e-8, max_iter=1000):
+def ridge_(beta, r, X, lambda_total=1.0, tol=1e-8, max_iter=1000, col_sq=None):
     r"""
-    ridge_(beta, r, X, lambda_total=1.0, tol=1e-8, max_iter=1000)
+    ridge_(beta, r, X, lambda_total=1.0, tol=1e-8, max_iter=1000, col_sq=None)
 
     Ridge regression.  This function finds the :math:`\vec{\beta}` that minimizes
 
@@ -60,6 +119,7 @@ def ridge_(beta, r, X, lambda_total=1.0, tol=1e-8, max_iter=1000):
         lambda_total (float): must be non-negative. total regularization penalty strength.
         tol (float): convergence criterion for coordinate descent. coordinate descent runs until the maximum element-wise change in **beta** is less than **tol**.
         max_iter (int): maximum number of update passes through all P elements of **beta**, in case **tol** is never met.
+        col_sq (numpy.ndarray): shape (D,) squared column norms :math:`||X_{:,j}||_2^2`. if ``None``, the columns of **X** are assumed to be standardized, i.e. :math:`||X_{:,j}||_2^2 = N`.
 
     Returns:
         converged (tuple): tuple ``(converged, iter_num)`` containing convergence information. ``converged`` (bool) is whether or not the algorithm converged in the alloted number of iterations) and ``iter_num`` (int) is how many iterations the algorithm ran for.
@@ -69,9 +129,12 @@ def ridge_(beta, r, X, lambda_total=1.0, tol=1e-8, max_iter=1000):
     """
 
     N, D = X.shape
+    norm_sq = _col_norm_sq(N, D, col_sq)
     beta_old = beta.copy()
-    delta_beta = np.ones(D, dtype=np.float64) + tol
-    rho = np.ones(D, dtype=np.float64) + tol
+    delta_beta = np.full(D, 1.0 + tol, dtype=beta.dtype)
+    rho = np.full(D, 1.0 + tol, dtype=beta.dtype)
+
+    dot = np.dot(X[:, 0], r)
 
     iter_num = 0
     converged = False
@@ -79,19 +142,23 @@ def ridge_(beta, r, X, lambda_total=1.0, tol=1e-8, max_iter=1000):
     while not converged and iter_num < max_iter:
         iter_num += 1
         for j in range(D):
-            rho[j] = np.dot(X[:, j], r) / N
-            beta[j] = (beta_old[j] + rho[j]) / (1 + lambda_total)
+            rho[j] = dot / N
+            beta[j] = (norm_sq[j] * beta_old[j] + rho[j]) / (norm_sq[j] + lambda_total)
             delta_beta[j] = beta[j] - beta_old[j]
-            r -= X[:, j] * delta_beta[j]
+            next_j = j + 1 if j + 1 < D else 0
+            if delta_beta[j] != 0.0:
+                dot = _axpy_dot(-delta_beta[j], X[:, j], r, X[:, next_j])
+            else:
+                dot = np.dot(X[:, next_j], r)
             beta_old[j] = beta[j]
         converged = np.max(np.abs(delta_beta)) < tol
     return (converged, iter_num)
 
 
 @jit(nopython=True, nogil=True, cache=True)  # pragma: no cover
-def lasso_(beta, r, X, lambda_total=1.0, tol=1e-8, max_iter=1000):
+def lasso_(beta, r, X, lambda_total=1.0, tol=1e-8, max_iter=1000, col_sq=None):
     r"""
-    lasso_(beta, r, X, lambda_total=1.0, tol=1e-8, max_iter=1000)
+    lasso_(beta, r, X, lambda_total=1.0, tol=1e-8, max_iter=1000, col_sq=None)
 
     Lasso regression.  This function finds the :math:`\vec{\beta}` that minimizes
 
@@ -106,15 +173,19 @@ def lasso_(beta, r, X, lambda_total=1.0, tol=1e-8, max_iter=1000):
         lambda_total (float): must be non-negative. total regularization penalty strength.
         tol (float): convergence criterion for coordinate descent. coordinate descent runs until the maximum element-wise change in **beta** is less than **tol**.
         max_iter (int): maximum number of update passes through all P elements of **beta**, in case **tol** is never met.
+        col_sq (numpy.ndarray): shape (D,) squared column norms :math:`||X_{:,j}||_2^2`. if ``None``, the columns of **X** are assumed to be standardized, i.e. :math:`||X_{:,j}||_2^2 = N`.
 
     Note
         **beta** and **r** are modified in-place.  As inputs, if :math:`\vec{\beta} = 0`, then it *must* be the case that :math:`\vec{r} = \vec{y}`, or the function will not converge to the correct answer.  In general, the inputs **beta** and **r** must be coordinated such that :math:`\vec{r} = \vec{y} - X\vec{\beta}`.
     """
 
     N, D = X.shape
+    norm_sq = _col_norm_sq(N, D, col_sq)
     beta_old = beta.copy()
-    delta_beta = np.ones(D, dtype=np.float64) + tol
-    rho = np.ones(D, dtype=np.float64) + tol
+    delta_beta = np.full(D, 1.0 + tol, dtype=beta.dtype)
+    rho = np.full(D, 1.0 + tol, dtype=beta.dtype)
+
+    dot = np.dot(X[:, 0], r)
 
     iter_num = 0
     converged = False
@@ -122,19 +193,142 @@ def lasso_(beta, r, X, lambda_total=1.0, tol=1e-8, max_iter=1000):
     while not converged and iter_num < max_iter:
         iter_num += 1
         for j in range(D):
-            rho[j] = np.dot(X[:, j], r) / N
-            beta[j] = math.soft_thresh(lambda_total, beta_old[j] + rho[j])
+            rho[j] = dot / N
+            beta[j] = (
+                math.soft_thresh(lambda_total, norm_sq[j] * beta_old[j] + rho[j])
+                / norm_sq[j]
+            )
             delta_beta[j] = beta[j] - beta_old[j]
-            r -= X[:, j] * delta_beta[j]
+            next_j = j + 1 if j + 1 < D else 0
+            if delta_beta[j] != 0.0:
+                dot = _axpy_dot(-delta_beta[j], X[:, j], r, X[:, next_j])
+            else:
+                dot = np.dot(X[:, next_j], r)
             beta_old[j] = beta[j]
         converged = np.max(np.abs(delta_beta)) < tol
     return (converged, iter_num)
 
 
 @jit(nopython=True, nogil=True, cache=True)  # pragma: no cover
-def elastic_net_(beta, r, X, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000):
+def lasso_path_(
+    beta, r, X, lambdas, tol=1e-8, max_iter=1000, warm_start=True, col_sq=None
+):
+    r"""
+    lasso_path_(beta, r, X, lambdas, tol=1e-8, max_iter=1000, warm_start=True, col_sq=None)
+
+    Lasso regularization path.  This function solves :meth:`lasso_` for every :math:`\lambda` in **lambdas** in a single compiled loop.
+    The penalties are visited from largest to smallest, and with **warm_start** each fit starts from the previous solution, which is already close to the next one along the path.
+
+    Args:
+        beta (numpy.ndarray): shape (D,) coefficient vector. modified in-place; on return it holds the solution for the last penalty visited.
+        r (numpy.ndarray): shape (N,) residual, i.e :math:`\vec{r} = \vec{y} - X\vec{\beta}`. modified in-place.
+        X (numpy.ndarray): shape (N,D) data matrix.
+        lambdas (numpy.ndarray): shape (L,) non-negative total regularization penalty strengths.
+        tol (float): convergence criterion for coordinate descent. coordinate descent runs until the maximum element-wise change in **beta** is less than **tol**.
+        max_iter (int): maximum number of update passes through all P elements of **beta**, in case **tol** is never met.
+        warm_start (bool): if ``True``, start each fit from the solution for the previous penalty, otherwise from :math:`\vec{\beta} = 0`.
+        col_sq (numpy.ndarray): shape (D,) squared column norms :math:`||X_{:,j}||_2^2`. if ``None``, the columns of **X** are assumed to be standardized, i.e. :math:`||X_{:,j}||_2^2 = N`.
+
+    Returns:
+        path (tuple): tuple ``(B, iter_nums, converged)``. ``B`` (numpy.ndarray) is the shape (D,L) matrix whose columns are the solutions for the corresponding entries of **lambdas**, and ``iter_nums`` (numpy.ndarray) and ``converged`` (numpy.ndarray) are shape (L,) arrays of the convergence information of each fit.
+
+    Note
+        **beta** and **r** are modified in-place.  As inputs, if :math:`\vec{\beta} = 0`, then it *must* be the case that :math:`\vec{r} = \vec{y}`, or the function will not converge to the correct answer.  In general, the inputs **beta** and **r** must be coordinated such that :math:`\vec{r} = \vec{y} - X\vec{\beta}`.
+    """
+
+    N, D = X.shape
+    L = lambdas.shape[0]
+    B = np.zeros((D, L), dtype=beta.dtype)
+    iter_nums = np.zeros(L, dtype=np.int64)
+    converged = np.zeros(L, dtype=np.bool_)
+
+    for k in np.argsort(lambdas)[::-1]:
+        if not warm_start:
+            r += np.dot(X, beta)
+            beta[:] = 0.0
+        converged[k], iter_nums[k] = lasso_(
+            beta,
+            r,
+            X,
+            lambda_total=lambdas[k],
+            tol=tol,
+            max_iter=max_iter,
+            col_sq=col_sq,
+        )
+        B[:, k] = beta
+    return (B, iter_nums, converged)
+
+
+@jit(nopython=True, nogil=True, cache=True)  # pragma: no cover
+def lasso_multi_(B, R, X, lambda_total=1.0, tol=1e-8, max_iter=1000, col_sq=None):
     r"""
-    elastic_net_(beta, r, X, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000)
+    lasso_multi_(B, R, X, lambda_total=1.0, tol=1e-8, max_iter=1000, col_sq=None)
+
+    Lasso regression for several targets sharing the same data matrix.  This function solves :meth:`lasso_` independently for every column of :math:`Y`, i.e. it finds the :math:`B` that minimizes
+
+    .. math::
+
+        \tfrac{1}{2N} ||Y-XB||_F^2 + \lambda \sum_{j,t} |B_{jt}|
+
+    All targets are swept together, so each column :math:`X_{:,j}` is read once per sweep for all :math:`T` targets: the inner products become a single vector-matrix product :math:`X_{:,j}^T R`, and the residual update a rank one update of :math:`R`.
+
+    Args:
+        B (numpy.ndarray): shape (D,T) coefficient matrix. modified in-place.
+        R (numpy.ndarray): shape (N,T) C-ordered residual matrix, i.e :math:`R = Y - XB`. modified in-place.
+        X (numpy.ndarray): shape (N,D) data matrix.
+        lambda_total (float): must be non-negative. total regularization penalty strength.
+        tol (float): convergence criterion for coordinate descent. coordinate descent runs until the maximum element-wise change in **B** is less than **tol**.
+        max_iter (int): maximum number of update passes through all rows of **B**, in case **tol** is never met.
+        col_sq (numpy.ndarray): shape (D,) squared column norms :math:`||X_{:,j}||_2^2`. if ``None``, the columns of **X** are assumed to be standardized, i.e. :math:`||X_{:,j}||_2^2 = N`.
+
+    Note
+        **B** and **R** are modified in-place.  As inputs, if :math:`B = 0`, then it *must* be the case that :math:`R = Y`, or the function will not converge to the correct answer.  In general, the inputs **B** and **R** must be coordinated such that :math:`R = Y - XB`.
+    """
+
+    N, D = X.shape
+    T = R.shape[1]
+    norm_sq = _col_norm_sq(N, D, col_sq)
+    delta = np.zeros(T, dtype=B.dtype)
+    rho = np.zeros(T, dtype=B.dtype)
+
+    iter_num = 0
+    converged = False
+
+    while not converged and iter_num < max_iter:
+        iter_num += 1
+        max_delta = 0.0
+        for j in range(D):
+            rho[:] = 0.0
+            for i in range(N):
+                x_ij = X[i, j]
+                for t in range(T):
+                    rho[t] += x_ij * R[i, t]
+            moved = False
+            for t in range(T):
+                beta_new = (
+                    math.soft_thresh(lambda_total, norm_sq[j] * B[j, t] + rho[t] / N)
+                    / norm_sq[j]
+                )
+                delta[t] = beta_new - B[j, t]
+                B[j, t] = beta_new
+                if delta[t] != 0.0:
+                    moved = True
+                    max_delta = max(max_delta, abs(delta[t]))
+            if moved:
+                for i in range(N):
+                    x_ij = X[i, j]
+                    for t in range(T):
+                        R[i, t] -= x_ij * delta[t]
+        converged = max_delta < tol
+    return (converged, iter_num)
+
+
+@jit(nopython=True, nogil=True, cache=True)  # pragma: no cover
+def elastic_net_(
+    beta, r, X, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000, col_sq=None
+):
+    r"""
+    elastic_net_(beta, r, X, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000, col_sq=None)
 
     Elastic net regression.  This function finds the :math:`\vec{\beta}` that minimizes
 
@@ -150,6 +344,7 @@ def elastic_net_(beta, r, X, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=10
         alpha (float): mixing parameter between L1 and L1 penalties. must be between zero and one. :math:`\alpha=0` is pure L2 penalty, :math:`\alpha=1` is pure L1 penalty.
         tol (float): convergence criterion for coordinate descent. coordinate descent runs until the maximum element-wise change in **beta** is less than **tol**.
         max_iter (int): maximum number of update passes through all P elements of **beta**, in case **tol** is never met.
+        col_sq (numpy.ndarray): shape (D,) squared column norms :math:`||X_{:,j}||_2^2`. if ``None``, the columns of **X** are assumed to be standardized, i.e. :math:`||X_{:,j}||_2^2 = N`.
 
     Note
         **beta** and **r** are modified in-place.  As inputs, if :math:`\vec{\beta} = 0`, then it *must* be the case that :math:`\vec{r} = \vec{y}`, or the function will not converge to the correct answer.  In general, the inputs **beta** and **r** must be coordinated such that :math:`\vec{r} = \vec{y} - X\vec{\beta}`.
@@ -159,9 +354,12 @@ def elastic_net_(beta, r, X, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=10
     lambda2 = (1.0 - alpha) * lambda_total
 
     N, D = X.shape
+    norm_sq = _col_norm_sq(N, D, col_sq)
     beta_old = beta.copy()
-    delta_beta = np.ones(D, dtype=np.float64) + tol
-    rho = np.ones(D, dtype=np.float64) + tol
+    delta_beta = np.full(D, 1.0 + tol, dtype=beta.dtype)
+    rho = np.full(D, 1.0 + tol, dtype=beta.dtype)
+
+    dot = np.dot(X[:, 0], r)
 
     iter_num = 0
     converged = False
@@ -169,10 +367,16 @@ def elastic_net_(beta, r, X, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=10
     while not converged and iter_num < max_iter:
         iter_num += 1
         for j in range(D):
-            rho[j] = np.dot(X[:, j], r) / N
-            beta[j] = math.soft_thresh(lambda1, beta_old[j] + rho[j]) / (1 + lambda2)
+            rho[j] = dot / N
+            beta[j] = math.soft_thresh(lambda1, norm_sq[j] * beta_old[j] + rho[j]) / (
+                norm_sq[j] + lambda2
+            )
             delta_beta[j] = beta[j] - beta_old[j]
-            r -= X[:, j] * delta_beta[j]
+            next_j = j + 1 if j + 1 < D else 0
+            if delta_beta[j] != 0.0:
+                dot = _axpy_dot(-delta_beta[j], X[:, j], r, X[:, next_j])
+            else:
+                dot = np.dot(X[:, next_j], r)
             beta_old[j] = beta[j]
         converged = np.max(np.abs(delta_beta)) < tol
     return (converged, iter_num)
@@ -180,10 +384,19 @@ def elastic_net_(beta, r, X, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=10
 
 @jit(nopython=True, nogil=True, cache=True)  # pragma: no cover
 def general_plastic_net_(
-    beta, r, X, xi, zeta, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000
+    beta,
+    r,
+    X,
+    xi,
+    zeta,
+    lambda_total=1.0,
+    alpha=0.75,
+    tol=1e-8,
+    max_iter=1000,
+    col_sq=None,
 ):
     r"""
-    general_plastic_net_(beta, r, X, xi, zeta, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000)
+    general_plastic_net_(beta, r, X, xi, zeta, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000, col_sq=None)
 
     General plastic net regression.  This function finds the :math:`\vec{\beta}` that minimizes
 
@@ -195,12 +408,13 @@ def general_plastic_net_(
         beta (numpy.ndarray): shape (P,) initial guess for the solution to the regression. modified in-place.
         r (numpy.ndarray): shape (N,) residual, i.e :math:`\vec{r} = \vec{y} - X\vec{\beta}`. modified in-place.
         X (numpy.ndarray): shape (N,P) data matrix.
-        xi (numpy.ndarray): shape (P,) target for L1 penalty.
-        zeta (numpy.ndarray): shape (P,) target for L2 penalty.
+        xi (numpy.ndarray): shape (P,) target for L1 penalty, or ``None`` for a zero target.
+        zeta (numpy.ndarray): shape (P,) target for L2 penalty, or ``None`` for a zero target.
         lambda_total (float): must be non-negative. total regularization penalty strength.
         alpha (float): mixing parameter between L1 and L1 penalties. must be between zero and one. :math:`\alpha=0` is pure L2 penalty, :math:`\alpha=1` is pure L1 penalty.
         tol (float): convergence criterion for coordinate descent. coordinate descent runs until the maximum element-wise change in **beta** is less than **tol**.
         max_iter (int): maximum number of update passes through all P elements of **beta**, in case **tol** is never met.
+        col_sq (numpy.ndarray): shape (D,) squared column norms :math:`||X_{:,j}||_2^2`. if ``None``, the columns of **X** are assumed to be standardized, i.e. :math:`||X_{:,j}||_2^2 = N`.
 
     Note
         **beta** and **r** are modified in-place.  As inputs, if :math:`\vec{\beta} = 0`, then it *must* be the case that :math:`\vec{r} = \vec{y}`, or the function will not converge to the correct answer.  In general, the inputs **beta** and **r** must be coordinated such that :math:`\vec{r} = \vec{y} - X\vec{\beta}`.
@@ -210,9 +424,12 @@ def general_plastic_net_(
     lambda2 = (1.0 - alpha) * lambda_total
 
     N, D = X.shape
+    norm_sq = _col_norm_sq(N, D, col_sq)
     beta_old = beta.copy()
-    delta_beta = np.ones(D, dtype=np.float64) + tol
-    rho = np.ones(D, dtype=np.float64) + tol
+    delta_beta = np.full(D, 1.0 + tol, dtype=beta.dtype)
+    rho = np.full(D, 1.0 + tol, dtype=beta.dtype)
+
+    dot = np.dot(X[:, 0], r)
 
     iter_num = 0
     converged = False
@@ -220,26 +437,238 @@ def general_plastic_net_(
     while not converged and iter_num < max_iter:
         iter_num += 1
         for j in range(D):
-            rho[j] = np.dot(X[:, j], r) / N
-            beta[j] = (
-                math.soft_thresh(
-                    lambda1,
-                    beta_old[j] + rho[j] + lambda2 * zeta[j] - (1 + lambda2) * xi[j],
-                )
-                / (1 + lambda2)
-                + xi[j]
+            rho[j] = dot / N
+            beta[j] = _plastic_update(
+                beta_old[j], rho[j], norm_sq[j], lambda1, lambda2, xi, zeta, j
             )
             delta_beta[j] = beta[j] - beta_old[j]
-            r -= X[:, j] * delta_beta[j]
+            next_j = j + 1 if j + 1 < D else 0
+            if delta_beta[j] != 0.0:
+                dot = _axpy_dot(-delta_beta[j], X[:, j], r, X[:, next_j])
+            else:
+                dot = np.dot(X[:, next_j], r)
             beta_old[j] = beta[j]
         converged = np.max(np.abs(delta_beta)) < tol
     return (converged, iter_num)
 
 
 @jit(nopython=True, nogil=True, cache=True)  # pragma: no cover
-def plastic_ridge_(beta, r, X, zeta, lambda_total=1.0, tol=1e-8, max_iter=1000):
+def _gram_rows(X, gram, gram_cached, block):
+    r"""Fills the rows **block** of the Gram matrix cache **gram** with :math:`X_{:,block}^T X` in a single matrix product, which streams :math:`X` once for the whole block rather than once per row."""
+    X_block = np.empty((X.shape[0], block.shape[0]), dtype=X.dtype)
+    for m in range(block.shape[0]):
+        X_block[:, m] = X[:, block[m]]
+    rows = np.dot(X_block.T, X)
+    for m in range(block.shape[0]):
+        gram[block[m]] = rows[m]
+        gram_cached[block[m]] = True
+
+
+@jit(nopython=True, nogil=True, cache=True)  # pragma: no cover
+def general_plastic_net_covariance_(
+    beta,
+    r,
+    X,
+    xi,
+    zeta,
+    Xty,
+    gram,
+    gram_cached,
+    lambda_total=1.0,
+    alpha=0.75,
+    tol=1e-8,
+    max_iter=1000,
+    col_sq=None,
+):
     r"""
-    plastic_ridge_(beta, r, X, zeta, lambda_total=1.0, tol=1e-8, max_iter=1000)
+    general_plastic_net_covariance_(beta, r, X, xi, zeta, Xty, gram, gram_cached, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000, col_sq=None)
+
+    General plastic net regression via covariance updates.  This function minimizes the same objective as :meth:`general_plastic_net_`, but instead of the residual it tracks the gradient :math:`X^T\vec{r}`, so that a coordinate update costs :math:`O(D)` when :math:`\beta_j` changes and :math:`O(1)` when it doesn't, rather than :math:`O(N)`.
+    The columns :math:`X^T X_{:,j}` of the Gram matrix are computed the first time :math:`\beta_j` moves and are cached in **gram** across calls, together with those of up to 127 later features that would move given the current gradient, so that one matrix product streams :math:`X` for the whole block.
+    This is the faster choice when :math:`N > D`.
+
+    Args:
+        beta (numpy.ndarray): shape (P,) initial guess for the solution to the regression. modified in-place.
+        r (numpy.ndarray): shape (N,) residual, i.e :math:`\vec{r} = \vec{y} - X\vec{\beta}`. modified in-place.
+        X (numpy.ndarray): shape (N,P) data matrix.
+        xi (numpy.ndarray): shape (P,) target for L1 penalty, or ``None`` for a zero target.
+        zeta (numpy.ndarray): shape (P,) target for L2 penalty, or ``None`` for a zero target.
+        Xty (numpy.ndarray): shape (P,) :math:`X^T\vec{y}`. only read when **beta** is zero.
+        gram (numpy.ndarray): shape (P,P) cache of Gram matrix columns. rows for which **gram_cached** is ``False`` may be uninitialized. modified in-place.
+        gram_cached (numpy.ndarray): shape (P,) boolean mask of which rows of **gram** are filled in. modified in-place.
+        lambda_total (float): must be non-negative. total regularization penalty strength.
+        alpha (float): mixing parameter between L1 and L1 penalties. must be between zero and one. :math:`\alpha=0` is pure L2 penalty, :math:`\alpha=1` is pure L1 penalty.
+        tol (float): convergence criterion for coordinate descent. coordinate descent runs until the maximum element-wise change in **beta** is less than **tol**.
+        max_iter (int): maximum number of update passes through all P elements of **beta**, in case **tol** is never met.
+        col_sq (numpy.ndarray): shape (D,) squared column norms :math:`||X_{:,j}||_2^2`. if ``None``, the columns of **X** are assumed to be standardized, i.e. :math:`||X_{:,j}||_2^2 = N`.
+
+    Note
+        **beta** and **r** are modified in-place.  As inputs, if :math:`\vec{\beta} = 0`, then it *must* be the case that :math:`\vec{r} = \vec{y}`, or the function will not converge to the correct answer.  In general, the inputs **beta** and **r** must be coordinated such that :math:`\vec{r} = \vec{y} - X\vec{\beta}`.
+    """
+
+    lambda1 = alpha * lambda_total
+    lambda2 = (1.0 - alpha) * lambda_total
+
+    N, D = X.shape
+    norm_sq = _col_norm_sq(N, D, col_sq)
+    beta_start = beta.copy()
+    beta_old = beta.copy()
+    delta_beta = np.full(D, 1.0 + tol, dtype=beta.dtype)
+    if np.any(beta):
+        c = np.dot(X.T, r)
+    else:
+        c = Xty.copy()
+    gram_block = min(D, 128)
+    block = np.empty(gram_block, dtype=np.int64)
+
+    iter_num = 0
+    converged = False
+
+    while not converged and iter_num < max_iter:
+        iter_num += 1
+        for j in range(D):
+            beta[j] = _plastic_update(
+                beta_old[j], c[j] / N, norm_sq[j], lambda1, lambda2, xi, zeta, j
+            )
+            delta_beta[j] = beta[j] - beta_old[j]
+            if delta_beta[j] != 0.0:
+                if not gram_cached[j]:
+                    n_block = 0
+                    for k in range(j, D):
+                        if n_block == gram_block:
+                            break
+                        if not gram_cached[k] and (
+                            k == j
+                            or _plastic_update(
+                                beta_old[k],
+                                c[k] / N,
+                                norm_sq[k],
+                                lambda1,
+                                lambda2,
+                                xi,
+                                zeta,
+                                k,
+                            )
+                            != beta_old[k]
+                        ):
+                            block[n_block] = k
+                            n_block += 1
+                    _gram_rows(X, gram, gram_cached, block[:n_block])
+                _axpy(-delta_beta[j], gram[j], c)
+            beta_old[j] = beta[j]
+        converged = np.max(np.abs(delta_beta)) < tol
+
+    for j in range(D):
+        if beta[j] != beta_start[j]:
+            _axpy(beta_start[j] - beta[j], X[:, j], r)
+    return (converged, iter_num)
+
+
+@jit(nopython=True, nogil=True, cache=True)  # pragma: no cover
+def _plastic_objective(beta, r, xi, zeta, lambda1, lambda2):
+    r"""General plastic net objective :math:`\tfrac{1}{2N}||\vec{r}||_2^2 + \lambda_1||\vec{\beta}-\vec{\xi}||_1 + \tfrac{\lambda_2}{2}||\vec{\beta}-\vec{\zeta}||_2^2`, with ``None`` standing in for a zero **xi** or **zeta**."""
+    objective = 0.5 * np.dot(r, r) / r.shape[0]
+    for j in range(beta.shape[0]):
+        b1 = beta[j]
+        if xi is not None:
+            b1 -= xi[j]
+        b2 = beta[j]
+        if zeta is not None:
+            b2 -= zeta[j]
+        objective += lambda1 * abs(b1) + 0.5 * lambda2 * b2 * b2
+    return objective
+
+
+@jit(nopython=True, nogil=True, cache=True, parallel=True)  # pragma: no cover
+def general_plastic_net_shotgun_(
+    beta,
+    r,
+    X,
+    xi,
+    zeta,
+    lambda_total=1.0,
+    alpha=0.75,
+    tol=1e-8,
+    max_iter=1000,
+    n_parallel=4,
+    col_sq=None,
+):
+    r"""
+    general_plastic_net_shotgun_(beta, r, X, xi, zeta, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000, n_parallel=4, col_sq=None)
+
+    General plastic net regression via parallel (Shotgun-style) coordinate descent.  This function minimizes the same objective as :meth:`general_plastic_net_`, splitting the coordinates into **n_parallel** contiguous blocks that are swept in parallel threads.
+    Each thread runs coordinate descent over its block against a private copy of the residual, and the changes of all blocks are then aggregated into a single residual correction, so that there is one parallel region per sweep.
+    If the aggregated step increases the objective (which can happen for features that are strongly correlated across blocks), the sweep falls back to the average of the per-block solutions, which by convexity never increases it.
+
+    Args:
+        beta (numpy.ndarray): shape (P,) initial guess for the solution to the regression. modified in-place.
+        r (numpy.ndarray): shape (N,) residual, i.e :math:`\vec{r} = \vec{y} - X\vec{\beta}`. modified in-place.
+        X (numpy.ndarray): shape (N,P) data matrix.
+        xi (numpy.ndarray): shape (P,) target for L1 penalty, or ``None`` for a zero target.
+        zeta (numpy.ndarray): shape (P,) target for L2 penalty, or ``None`` for a zero target.
+        lambda_total (float): must be non-negative. total regularization penalty strength.
+        alpha (float): mixing parameter between L1 and L1 penalties. must be between zero and one. :math:`\alpha=0` is pure L2 penalty, :math:`\alpha=1` is pure L1 penalty.
+        tol (float): convergence criterion for coordinate descent. coordinate descent runs until the maximum element-wise change in **beta** is less than **tol**.
+        max_iter (int): maximum number of update passes through all P elements of **beta**, in case **tol** is never met.
+        n_parallel (int): number of blocks of coordinates updated in parallel.
+        col_sq (numpy.ndarray): shape (D,) squared column norms :math:`||X_{:,j}||_2^2`. if ``None``, the columns of **X** are assumed to be standardized, i.e. :math:`||X_{:,j}||_2^2 = N`.
+
+    Note
+        **beta** and **r** are modified in-place.  As inputs, if :math:`\vec{\beta} = 0`, then it *must* be the case that :math:`\vec{r} = \vec{y}`, or the function will not converge to the correct answer.  In general, the inputs **beta** and **r** must be coordinated such that :math:`\vec{r} = \vec{y} - X\vec{\beta}`.
+    """
+
+    lambda1 = alpha * lambda_total
+    lambda2 = (1.0 - alpha) * lambda_total
+
+    N, D = X.shape
+    norm_sq = _col_norm_sq(N, D, col_sq)
+    n_blocks = max(1, min(n_parallel, D))
+    delta_beta = np.full(D, 1.0 + tol, dtype=beta.dtype)
+    beta_start = beta.copy()
+    r_start = r.copy()
+    r_block = np.empty((n_blocks, N), dtype=r.dtype)
+    objective = _plastic_objective(beta, r, xi, zeta, lambda1, lambda2)
+
+    iter_num = 0
+    converged = False
+
+    while not converged and iter_num < max_iter:
+        iter_num += 1
+        beta_start[:] = beta
+        r_start[:] = r
+        for t in prange(n_blocks):
+            r_t = r_block[t]
+            r_t[:] = r_start
+            for j in range(t * D // n_blocks, (t + 1) * D // n_blocks):
+                rho = _dot(X[:, j], r_t) / N
+                beta_new = _plastic_update(
+                    beta[j], rho, norm_sq[j], lambda1, lambda2, xi, zeta, j
+                )
+                delta_beta[j] = beta_new - beta[j]
+                beta[j] = beta_new
+                if delta_beta[j] != 0.0:
+                    _axpy(-delta_beta[j], X[:, j], r_t)
+        for t in range(n_blocks):
+            for i in range(N):
+                r[i] += r_block[t, i] - r_start[i]
+
+        objective_new = _plastic_objective(beta, r, xi, zeta, lambda1, lambda2)
+        if objective_new > objective:
+            delta_beta /= n_blocks
+            beta[:] = beta_start + delta_beta
+            r[:] = r_start + (r - r_start) / n_blocks
+            objective_new = _plastic_objective(beta, r, xi, zeta, lambda1, lambda2)
+        objective = objective_new
+        converged = np.max(np.abs(delta_beta)) < tol
+    return (converged, iter_num)
+
+
+@jit(nopython=True, nogil=True, cache=True)  # pragma: no cover
+def plastic_ridge_(
+    beta, r, X, zeta, lambda_total=1.0, tol=1e-8, max_iter=1000, col_sq=None
+):
+    r"""
+    plastic_ridge_(beta, r, X, zeta, lambda_total=1.0, tol=1e-8, max_iter=1000, col_sq=None)
 
     Plastic ridge regression.  This function finds the :math:`\vec{\beta}` that minimizes
 
@@ -255,31 +684,33 @@ def plastic_ridge_(beta, r, X, zeta, lambda_total=1.0, tol=1e-8, max_iter=1000):
         lambda_total (float): must be non-negative. total regularization penalty strength.
         tol (float): convergence criterion for coordinate descent. coordinate descent runs until the maximum element-wise change in **beta** is less than **tol**.
         max_iter (int): maximum number of update passes through all P elements of **beta**, in case **tol** is never met.
+        col_sq (numpy.ndarray): shape (D,) squared column norms :math:`||X_{:,j}||_2^2`. if ``None``, the columns of **X** are assumed to be standardized, i.e. :math:`||X_{:,j}||_2^2 = N`.
 
     Note
         **beta** and **r** are modified in-place.  As inputs, if :math:`\vec{\beta} = 0`, then it *must* be the case that :math:`\vec{r} = \vec{y}`, or the function will not converge to the correct answer.  In general, the inputs **beta** and **r** must be coordinated such that :math:`\vec{r} = \vec{y} - X\vec{\beta}`.
     """
 
-    N, D = X.shape
-
     converged, iter_num = general_plastic_net_(
         beta,
         r,
         X,
-        np.zeros(D, dtype=np.float64),
+        None,
         zeta,
         lambda_total=lambda_total,
         alpha=0.0,
         tol=tol,
         max_iter=max_iter,
+        col_sq=col_sq,
     )
     return (converged, iter_num)
 
 
 @jit(nopython=True, nogil=True, cache=True)  # pragma: no cover
-def plastic_lasso_(beta, r, X, xi, lambda_total=1.0, tol=1e-8, max_iter=1000):
+def plastic_lasso_(
+    beta, r, X, xi, lambda_total=1.0, tol=1e-8, max_iter=1000, col_sq=None
+):
     r"""
-    plastic_lasso_(beta, r, X, xi, lambda_total=1.0, tol=1e-8, max_iter=1000)
+    plastic_lasso_(beta, r, X, xi, lambda_total=1.0, tol=1e-8, max_iter=1000, col_sq=None)
 
     Plastic lasso regression.  This function finds the :math:`\vec{\beta}` that minimizes
 
@@ -295,33 +726,33 @@ def plastic_lasso_(beta, r, X, xi, lambda_total=1.0, tol=1e-8, max_iter=1000):
         lambda_total (float): must be non-negative. total regularization penalty strength.
         tol (float): convergence criterion for coordinate descent. coordinate descent runs until the maximum element-wise change in **beta** is less than **tol**.
         max_iter (int): maximum number of update passes through all P elements of **beta**, in case **tol** is never met.
+        col_sq (numpy.ndarray): shape (D,) squared column norms :math:`||X_{:,j}||_2^2`. if ``None``, the columns of **X** are assumed to be standardized, i.e. :math:`||X_{:,j}||_2^2 = N`.
 
     Note
         **beta** and **r** are modified in-place.  As inputs, if :math:`\vec{\beta} = 0`, then it *must* be the case that :math:`\vec{r} = \vec{y}`, or the function will not converge to the correct answer.  In general, the inputs **beta** and **r** must be coordinated such that :math:`\vec{r} = \vec{y} - X\vec{\beta}`.
     """
 
-    N, D = X.shape
-
     converged, iter_num = general_plastic_net_(
         beta,
         r,
         X,
         xi,
-        np.zeros(D, dtype=np.float64),
+        None,
         lambda_total=lambda_total,
         alpha=1.0,
         tol=tol,
         max_iter=max_iter,
+        col_sq=col_sq,
     )
     return (converged, iter_num)
 
 
 @jit(nopython=True, nogil=True, cache=True)  # pragma: no cover
 def hard_plastic_net_(
-    beta, r, X, xi, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000
+    beta, r, X, xi, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000, col_sq=None
 ):
     r"""
-    hard_plastic_net_(beta, r, X, xi, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000)
+    hard_plastic_net_(beta, r, X, xi, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000, col_sq=None)
 
     Hard plastic net regression.  This function finds the :math:`\vec{\beta}` that minimizes
 
@@ -338,33 +769,33 @@ def hard_plastic_net_(
         alpha (float): mixing parameter between L1 and L1 penalties. must be between zero and one. :math:`\alpha=0` is pure L2 penalty, :math:`\alpha=1` is pure L1 penalty.
         tol (float): convergence criterion for coordinate descent. coordinate descent runs until the maximum element-wise change in **beta** is less than **tol**.
         max_iter (int): maximum number of update passes through all P elements of **beta**, in case **tol** is never met.
+        col_sq (numpy.ndarray): shape (D,) squared column norms :math:`||X_{:,j}||_2^2`. if ``None``, the columns of **X** are assumed to be standardized, i.e. :math:`||X_{:,j}||_2^2 = N`.
 
     Note
         **beta** and **r** are modified in-place.  As inputs, if :math:`\vec{\beta} = 0`, then it *must* be the case that :math:`\vec{r} = \vec{y}`, or the function will not converge to the correct answer.  In general, the inputs **beta** and **r** must be coordinated such that :math:`\vec{r} = \vec{y} - X\vec{\beta}`.
     """
 
-    N, D = X.shape
-
     converged, iter_num = general_plastic_net_(
         beta,
         r,
         X,
         xi,
-        np.zeros(D, dtype=np.float64),
+        None,
         lambda_total=lambda_total,
         alpha=alpha,
         tol=tol,
         max_iter=max_iter,
+        col_sq=col_sq,
     )
     return (converged, iter_num)
 
 
 @jit(nopython=True, nogil=True, cache=True)  # pragma: no cover
 def soft_plastic_net_(
-    beta, r, X, zeta, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000
+    beta, r, X, zeta, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000, col_sq=None
 ):
     r"""
-    soft_plastic_net_(beta, r, X, zeta, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000)
+    soft_plastic_net_(beta, r, X, zeta, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000, col_sq=None)
 
     Soft plastic net regression.  This function finds the :math:`\vec{\beta}` that minimizes
 
@@ -381,33 +812,33 @@ def soft_plastic_net_(
         alpha (float): mixing parameter between L1 and L1 penalties. must be between zero and one. :math:`\alpha=0` is pure L2 penalty, :math:`\alpha=1` is pure L1 penalty.
         tol (float): convergence criterion for coordinate descent. coordinate descent runs until the maximum element-wise change in **beta** is less than **tol**.
         max_iter (int): maximum number of update passes through all P elements of **beta**, in case **tol** is never met.
+        col_sq (numpy.ndarray): shape (D,) squared column norms :math:`||X_{:,j}||_2^2`. if ``None``, the columns of **X** are assumed to be standardized, i.e. :math:`||X_{:,j}||_2^2 = N`.
 
     Note
         **beta** and **r** are modified in-place.  As inputs, if :math:`\vec{\beta} = 0`, then it *must* be the case that :math:`\vec{r} = \vec{y}`, or the function will not converge to the correct answer.  In general, the inputs **beta** and **r** must be coordinated such that :math:`\vec{r} = \vec{y} - X\vec{\beta}`.
     """
 
-    N, D = X.shape
-
     converged, iter_num = general_plastic_net_(
         beta,
         r,
         X,
-        np.zeros(D, dtype=np.float64),
+        None,
         zeta,
         lambda_total=lambda_total,
         alpha=alpha,
         tol=tol,
         max_iter=max_iter,
+        col_sq=col_sq,
     )
     return (converged, iter_num)
 
 
 @jit(nopython=True, nogil=True, cache=True)  # pragma: no cover
 def unified_plastic_net_(
-    beta, r, X, xi, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000
+    beta, r, X, xi, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000, col_sq=None
 ):
     r"""
-    unified_plastic_net_(beta, r, X, xi, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000)
+    unified_plastic_net_(beta, r, X, xi, lambda_total=1.0, alpha=0.75, tol=1e-8, max_iter=1000, col_sq=None)
 
     Unified plastic net regression.  This function finds the :math:`\vec{\beta}` that minimizes
 
@@ -424,6 +855,7 @@ def unified_plastic_net_(
         alpha (float): mixing parameter between L1 and L1 penalties. must be between zero and one. :math:`\alpha=0` is pure L2 penalty, :math:`\alpha=1` is pure L1 penalty.
         tol (float): convergence criterion for coordinate descent. coordinate descent runs until the maximum element-wise change in **beta** is less than **tol**.
         max_iter (int): maximum number of update passes through all P elements of **beta**, in case **tol** is never met.
+        col_sq (numpy.ndarray): shape (D,) squared column norms :math:`||X_{:,j}||_2^2`. if ``None``, the columns of **X** are assumed to be standardized, i.e. :math:`||X_{:,j}||_2^2 = N`.
 
     Note
         **beta** and **r** are modified in-place.  As inputs, if :math:`\vec{\beta} = 0`, then it *must* be the case that :math:`\vec{r} = \vec{y}`, or the function will not converge to the correct answer.  In general, the inputs **beta** and **r** must be coordinated such that :math:`\vec{r} = \vec{y} - X\vec{\beta}`.
@@ -441,5 +873,6 @@ def unified_plastic_net_(
         alpha=alpha,
         tol=tol,
         max_iter=max_iter,
+        col_sq=col_sq,
     )
     return (converged, iter_num)
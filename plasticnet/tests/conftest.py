@@ -0,0 +1,8 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def seed():
+    r"""Seeds numpy's global random state before every test, so that the randomly drawn penalties and target vectors are reproducible."""
+    np.random.seed(0)
@@ -0,0 +1,24 @@
+from functools import lru_cache
+
+import numpy as np
+
+from sklearn.preprocessing import scale
+from sklearn.datasets import make_regression
+
+
+@lru_cache(maxsize=None)
+def regression_data(N, D, n_informative, seed=0):
+    r"""Standardized, seeded sklearn regression problem of shape (N,D), generated once per set of arguments and shared between tests. The returned arrays are read-only, so a test that needs to modify them must copy them first."""
+
+    X, y = make_regression(
+        n_samples=N, n_features=D, n_informative=n_informative, random_state=seed
+    )
+    X, y = scale(X), scale(y)
+    X.flags.writeable = False
+    y.flags.writeable = False
+    return X, y
+
+
+def lambda_max(X, y):
+    r"""Smallest L1 penalty :math:`\lambda_{max} = ||X^T\vec{y}||_\infty / N` for which the lasso solution is zero. Tests draw L1 penalties as a fraction of it, so that the solutions they compare are not trivially zero."""
+    return np.max(np.abs(np.dot(X.T, y))) / X.shape[0]
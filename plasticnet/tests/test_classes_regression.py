@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 
 from sklearn import linear_model
 from sklearn.preprocessing import scale
@@ -6,16 +7,16 @@ from sklearn.datasets import make_regression
 
 from plasticnet.classes import Regression
 
+from .data import lambda_max, regression_data
+
 
 def test_set_beta(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test beta property"""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N)
 
     lm_pnet = Regression(X, y)
+    beta, r = lm_pnet.beta, lm_pnet._r
 
     new_beta = np.random.randn(D)
     new_r = y - np.dot(X, new_beta)
@@ -23,15 +24,97 @@ def test_set_beta(N=500, D=1000, tol=1e-12, max_iter=10000):
 
     np.testing.assert_almost_equal(lm_pnet.beta, new_beta, decimal=4)
     np.testing.assert_almost_equal(lm_pnet._r, new_r, decimal=4)
+    assert lm_pnet.beta is beta and lm_pnet._r is r
+
+
+def test_set_beta_shape(N=200, D=100):
+    r"""Test that the beta property rejects values that do not have shape (D,), without touching :math:`\vec{\beta}` or the residual"""
+
+    X, y = regression_data(N, D, D // 10)
+
+    lm_pnet = Regression(X, y)
+    lm_pnet.beta = np.random.randn(D)
+    beta, r = lm_pnet.beta.copy(), lm_pnet._r.copy()
+
+    for value in [0.5, np.random.randn(D + 1), np.random.randn(D, 1)]:
+        with pytest.raises(ValueError):
+            lm_pnet.beta = value
+
+    np.testing.assert_array_equal(lm_pnet.beta, beta)
+    np.testing.assert_array_equal(lm_pnet._r, r)
+
+
+def test_set_y(N=500, D=1000, tol=1e-12, max_iter=10000):
+    r"""Test that reassigning the y property rebinds the solvers, matching a freshly constructed :class:`plasticnet.classes.Regression`"""
+
+    X, y = regression_data(N, D, N // 10)
+    y_new = scale(np.random.randn(N))
+
+    lambda_total = np.random.exponential()
+
+    lm_pnet = Regression(X, y)
+    lm_pnet.fit_ridge(lambda_total=lambda_total, tol=tol, max_iter=max_iter)
+    lm_pnet.y = y_new
+    np.testing.assert_array_equal(lm_pnet.beta, np.zeros(D))
+    lm_pnet.fit_ridge(lambda_total=lambda_total, tol=tol, max_iter=max_iter)
+
+    lm_fresh = Regression(X, y_new)
+    lm_fresh.fit_ridge(lambda_total=lambda_total, tol=tol, max_iter=max_iter)
+
+    np.testing.assert_almost_equal(lm_fresh.beta, lm_pnet.beta, decimal=8)
+    np.testing.assert_almost_equal(lm_fresh._r, lm_pnet._r, decimal=8)
+
+
+def test_set_data(N=200, D=100, tol=1e-12, max_iter=10000):
+    r"""Test that :meth:`plasticnet.classes.Regression.set_data` can change the number of samples, that the X and y setters reject mismatched shapes, and that the y setter keeps the state derived from X alone"""
+
+    X, y = regression_data(N, D, D // 10)
+    X_new, y_new = regression_data(N + 100, D, D // 10, seed=1)
+
+    lambda_total = lambda_max(X_new, y_new) * np.random.rand()
+
+    lm_pnet = Regression(X, y)
+    with pytest.raises(ValueError):
+        lm_pnet.y = y_new
+    with pytest.raises(ValueError):
+        lm_pnet.X = X_new
+
+    lm_pnet.fit_ridge(lambda_total=lambda_total)
+    col_sq, gram = lm_pnet._col_sq, lm_pnet._gram
+    lm_pnet.y = y[::-1]
+    assert lm_pnet._col_sq is col_sq and lm_pnet._gram is gram
+
+    lm_pnet.set_data(X_new, y_new)
+    lm_pnet.fit_lasso(lambda_total=lambda_total, tol=tol, max_iter=max_iter)
+
+    lm_fresh = Regression(X_new, y_new)
+    lm_fresh.fit_lasso(lambda_total=lambda_total, tol=tol, max_iter=max_iter)
+
+    np.testing.assert_almost_equal(lm_fresh.beta, lm_pnet.beta, decimal=8)
+    np.testing.assert_almost_equal(lm_fresh._r, lm_pnet._r, decimal=8)
+
+
+def test_set_beta_sparse_update(N=500, D=1000):
+    r"""Test beta property when only a few coefficients change"""
+
+    X, y = regression_data(N, D, N)
+
+    lm_pnet = Regression(X, y)
+    lm_pnet.beta = np.random.randn(D)
+
+    new_beta = lm_pnet.beta.copy()
+    new_beta[np.random.choice(D, D // 100, replace=False)] += np.random.randn(D // 100)
+    new_r = y - np.dot(X, new_beta)
+    lm_pnet.beta = new_beta
+
+    np.testing.assert_almost_equal(lm_pnet.beta, new_beta, decimal=4)
+    np.testing.assert_almost_equal(lm_pnet._r, new_r, decimal=4)
 
 
 def test_ordinary_least_squares_explicit(N=1500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test explicitly coded special case OLS numba code in :meth:`plasticnet.classes.Regression.fit_ordinary_least_squares` against sklearn LinearRegression"""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N)
 
     lm = linear_model.LinearRegression()
     lm.fit(X, y)
@@ -42,13 +125,29 @@ def test_ordinary_least_squares_explicit(N=1500, D=1000, tol=1e-12, max_iter=100
     np.testing.assert_almost_equal(lm.coef_, lm_pnet.beta, decimal=4)
 
 
+def test_ordinary_least_squares_rank_deficient(
+    N=1500, D=100, tol=1e-12, max_iter=10000
+):
+    r"""Test that :meth:`plasticnet.classes.Regression.fit_ordinary_least_squares` falls back to coordinate descent for a rank deficient :math:`X`, comparing fitted values against sklearn LinearRegression"""
+
+    X, y = regression_data(N, D, D)
+    X = X.copy()
+    X[:, -1] = X[:, 0]
+
+    lm = linear_model.LinearRegression()
+    lm.fit(X, y)
+
+    lm_pnet = Regression(X, y)
+    lm_pnet.fit_ordinary_least_squares(tol=tol, max_iter=max_iter)
+
+    assert lm_pnet.iter_num > 0
+    np.testing.assert_almost_equal(lm.predict(X), y - lm_pnet._r, decimal=4)
+
+
 def test_ridge_explicit(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test explicitly coded special case ridge numba code in :meth:`plasticnet.classes.Regression.fit_ridge` against sklearn elastic net with l1_ratio=0"""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N // 10)
 
     lambda_total = np.random.exponential()
 
@@ -61,37 +160,272 @@ def test_ridge_explicit(N=500, D=1000, tol=1e-12, max_iter=10000):
     np.testing.assert_almost_equal(lm.coef_, lm_pnet.beta, decimal=4)
 
 
+def test_ridge_cholesky(N=1000, D=200):
+    r"""Test the direct Cholesky solve in :meth:`plasticnet.classes.Regression.fit_ridge` for :math:`N > D` against sklearn Ridge, over two penalties sharing one Gram matrix"""
+
+    X, y = regression_data(N, D, D // 10)
+
+    lm_pnet = Regression(X, y)
+    for lambda_total in np.random.exponential(size=2):
+        lm = linear_model.Ridge(alpha=lambda_total * N, fit_intercept=False)
+        lm.fit(X, y)
+
+        lm_pnet.fit_ridge(lambda_total=lambda_total)
+
+        np.testing.assert_almost_equal(lm.coef_, lm_pnet.beta, decimal=8)
+        np.testing.assert_almost_equal(y - X @ lm.coef_, lm_pnet._r, decimal=8)
+
+
+def test_ridge_cholesky_rank_deficient(N=100, D=10, tol=1e-12, max_iter=10000):
+    r"""Test that :meth:`plasticnet.classes.Regression.fit_ridge` falls back to coordinate descent when the Cholesky factorization fails for a rank deficient :math:`X` and a vanishing penalty, comparing fitted values against sklearn LinearRegression"""
+
+    X, y = regression_data(N, D, D)
+    X = X.copy()
+    X[:, -1] = X[:, 0]
+
+    lm = linear_model.LinearRegression()
+    lm.fit(X, y)
+
+    lm_pnet = Regression(X, y)
+    lm_pnet.fit_ridge(lambda_total=1e-17, tol=tol, max_iter=max_iter)
+
+    assert lm_pnet.iter_num > 0
+    np.testing.assert_almost_equal(lm.predict(X), y - lm_pnet._r, decimal=4)
+
+
 def test_lasso_explicit(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test explicitly coded special case lasso numba code in :meth:`plasticnet.classes.Regression.fit_lasso` against sklearn elastic net with `l1_ratio=1`"""
 
+    X, y = regression_data(N, D, N // 10)
+
+    lambda_total = lambda_max(X, y) * np.random.rand()
+
+    lm = linear_model.ElasticNet(
+        alpha=lambda_total, l1_ratio=1.0, tol=tol, max_iter=max_iter
+    )
+    lm.fit(X, y)
+
+    lm_pnet = Regression(X, y)
+    lm_pnet.fit_lasso(lambda_total=lambda_total, tol=tol, max_iter=max_iter)
+
+    np.testing.assert_almost_equal(lm.coef_, lm_pnet.beta, decimal=4)
+
+
+def test_lasso_unstandardized(N=500, D=1000, tol=1e-12, max_iter=10000):
+    r"""Test :meth:`plasticnet.classes.Regression.fit_lasso` on data whose columns are not unit variance against sklearn elastic net with `l1_ratio=1`"""
+
     X, y, beta_true = make_regression(
         n_samples=N, n_features=D, n_informative=N // 10, coef=True
     )
-    X, y = scale(X), scale(y)
+    X, y = scale(X) * np.random.exponential(size=D), scale(y)
 
     lambda_total = np.random.exponential()
 
+    lm = linear_model.ElasticNet(
+        alpha=lambda_total,
+        l1_ratio=1.0,
+        fit_intercept=False,
+        tol=tol,
+        max_iter=max_iter,
+    )
+    lm.fit(X, y)
+
+    lm_pnet = Regression(X, y)
+    lm_pnet.fit_lasso(lambda_total=lambda_total, tol=tol, max_iter=max_iter)
+
+    np.testing.assert_almost_equal(lm.coef_, lm_pnet.beta, decimal=4)
+
+
+def test_lasso_float32(N=500, D=1000, tol=1e-12, max_iter=10000):
+    r"""Test :meth:`plasticnet.classes.Regression.fit_lasso` in single precision against sklearn elastic net with `l1_ratio=1`"""
+
+    X, y = regression_data(N, D, N // 10)
+
+    lambda_total = lambda_max(X, y) * np.random.rand()
+
     lm = linear_model.ElasticNet(
         alpha=lambda_total, l1_ratio=1.0, tol=tol, max_iter=max_iter
     )
     lm.fit(X, y)
 
+    lm_pnet = Regression(X, y, dtype=np.float32)
+    lm_pnet.fit_lasso(lambda_total=lambda_total, tol=tol, max_iter=max_iter)
+
+    assert lm_pnet.beta.dtype == np.float32
+    np.testing.assert_almost_equal(lm.coef_, lm_pnet.beta, decimal=3)
+
+
+@pytest.mark.parametrize("warm_start", [True, False])
+def test_lasso_path(warm_start, N=500, D=1000, tol=1e-12, max_iter=10000):
+    r"""Test :meth:`plasticnet.classes.Regression.fit_lasso_path` against sklearn elastic net with `l1_ratio=1` at each of an unsorted set of penalties."""
+
+    X, y = regression_data(N, D, N // 10)
+
+    lambdas = lambda_max(X, y) * np.random.rand(4)
+    assert np.any(np.diff(lambdas) > 0)
+
+    lm_pnet = Regression(X, y)
+    lm_pnet.fit_lasso_path(lambdas, tol=tol, max_iter=max_iter, warm_start=warm_start)
+
+    for k, lambda_total in enumerate(lambdas):
+        lm = linear_model.ElasticNet(
+            alpha=lambda_total, l1_ratio=1.0, tol=tol, max_iter=max_iter
+        )
+        lm.fit(X, y)
+        np.testing.assert_almost_equal(lm.coef_, lm_pnet.beta_path[:, k], decimal=4)
+
+    np.testing.assert_almost_equal(
+        lm_pnet.beta_path[:, np.argmin(lambdas)], lm_pnet.beta, decimal=10
+    )
+
+
+def test_lasso_multi(N=500, D=1000, T=3, tol=1e-12, max_iter=10000):
+    r"""Test :meth:`plasticnet.classes.Regression.fit_lasso_multi` against sklearn elastic net with `l1_ratio=1` and a matrix target"""
+
+    X, Y, beta_true = make_regression(
+        n_samples=N, n_features=D, n_informative=N // 10, n_targets=T, coef=True
+    )
+    X, Y = scale(X), scale(Y)
+
+    lambda_total = min(lambda_max(X, Y[:, t]) for t in range(T)) * np.random.rand()
+
+    lm = linear_model.ElasticNet(
+        alpha=lambda_total, l1_ratio=1.0, tol=tol, max_iter=max_iter
+    )
+    lm.fit(X, Y)
+
+    lm_pnet = Regression(X, Y[:, 0])
+    lm_pnet.fit_lasso_multi(Y, lambda_total=lambda_total, tol=tol, max_iter=max_iter)
+
+    np.testing.assert_almost_equal(lm.coef_.T, lm_pnet.beta_multi, decimal=4)
+
+
+def test_lasso_multi_shapes(N=500, D=1000):
+    r"""Test that :meth:`plasticnet.classes.Regression.fit_lasso_multi` treats a 1-D target as a single column, matching :meth:`plasticnet.classes.Regression.fit_lasso`, and rejects a target with the wrong number of samples"""
+
+    X, y = regression_data(N, D, N // 10)
+
+    lambda_total = lambda_max(X, y) * np.random.rand()
+
     lm_pnet = Regression(X, y)
+    lm_pnet.fit_lasso_multi(y, lambda_total=lambda_total)
+    assert lm_pnet.beta_multi.shape == (D, 1)
+
+    lm_pnet.fit_lasso(lambda_total=lambda_total)
+    np.testing.assert_almost_equal(lm_pnet.beta, lm_pnet.beta_multi[:, 0], decimal=6)
+
+    with pytest.raises(ValueError):
+        lm_pnet.fit_lasso_multi(np.zeros((N + 1, 2)), lambda_total=lambda_total)
+
+
+def test_lasso_screening(N=500, D=1000, tol=1e-12, max_iter=10000):
+    r"""Test the strong rule screening in :meth:`plasticnet.classes.Regression.fit_lasso`: a penalty above :math:`\lambda_{max}` gives :math:`\vec{\beta} = 0`, and a warm started fit below it matches sklearn elastic net with `l1_ratio=1`"""
+
+    X, y = regression_data(N, D, N // 10)
+
+    lambda_total = lambda_max(X, y) * np.random.rand()
+
+    lm = linear_model.ElasticNet(
+        alpha=lambda_total, l1_ratio=1.0, tol=tol, max_iter=max_iter
+    )
+    lm.fit(X, y)
+
+    lm_pnet = Regression(X, y)
+    lm_pnet.fit_lasso(lambda_total=1.1 * lambda_max(X, y), tol=tol, max_iter=max_iter)
+
+    np.testing.assert_equal(lm_pnet.beta, np.zeros(D))
+
     lm_pnet.fit_lasso(lambda_total=lambda_total, tol=tol, max_iter=max_iter)
 
     np.testing.assert_almost_equal(lm.coef_, lm_pnet.beta, decimal=4)
 
 
-def test_elastic_net_explicit(N=500, D=1000, tol=1e-12, max_iter=10000):
-    r"""Test explicitly coded special case elastic net numba code in :meth:`plasticnet.classes.Regression.fit_elastic_net` against sklearn elastic net."""
+@pytest.mark.parametrize("N, D", [(500, 1000), (1000, 200)])
+def test_lasso_shotgun(N, D, tol=1e-12, max_iter=10000):
+    r"""Test parallel coordinate descent in :meth:`plasticnet.classes.Regression.fit_lasso` against sklearn elastic net with `l1_ratio=1`"""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
+    X, y = regression_data(N, D, D // 10)
+
+    lambda_total = lambda_max(X, y) * np.random.rand()
+
+    lm = linear_model.ElasticNet(
+        alpha=lambda_total, l1_ratio=1.0, tol=tol, max_iter=max_iter
+    )
+    lm.fit(X, y)
+
+    lm_pnet = Regression(X, y)
+    lm_pnet.fit_lasso(
+        lambda_total=lambda_total, tol=tol, max_iter=max_iter, n_parallel=4
+    )
+
+    np.testing.assert_almost_equal(lm.coef_, lm_pnet.beta, decimal=4)
+    np.testing.assert_almost_equal(y - np.dot(X, lm_pnet.beta), lm_pnet._r, decimal=4)
+
+
+def test_elastic_net_covariance(N=1000, D=200, tol=1e-12, max_iter=10000):
+    r"""Test the covariance update path of :meth:`plasticnet.classes.Regression.fit_elastic_net` (:math:`N > D`), warm started from a previous fit, against sklearn elastic net. :math:`X` has low effective rank, so that the fits do not converge within the residual sweeps that precede the covariance updates, and only part of the Gram matrix is computed."""
+
+    X, y = make_regression(
+        n_samples=N, n_features=D, n_informative=D // 10, effective_rank=5
     )
     X, y = scale(X), scale(y)
 
+    lambda_total = lambda_max(X, y) * np.random.rand()
+    alpha = np.random.rand()
+
+    lm = linear_model.ElasticNet(
+        alpha=lambda_total, l1_ratio=alpha, tol=tol, max_iter=max_iter
+    )
+    lm.fit(X, y)
+
+    lm_pnet = Regression(X, y)
+    lm_pnet.fit_elastic_net(
+        lambda_total=2 * lambda_total, alpha=alpha, tol=tol, max_iter=max_iter
+    )
+    lm_pnet.fit_elastic_net(
+        lambda_total=lambda_total, alpha=alpha, tol=tol, max_iter=max_iter
+    )
+
+    cached = lm_pnet._gram_cached
+    assert 0 < np.sum(cached) < D
+    np.testing.assert_almost_equal(lm_pnet._gram[cached], np.dot(X.T, X)[cached])
+    np.testing.assert_almost_equal(lm.coef_, lm_pnet.beta, decimal=4)
+    np.testing.assert_almost_equal(y - np.dot(X, lm_pnet.beta), lm_pnet._r, decimal=4)
+
+
+@pytest.mark.parametrize("N, D", [(500, 1000), (1000, 200)])
+def test_general_plastic_net_one_target(N, D, tol=1e-12, max_iter=10000):
+    r"""Test :meth:`plasticnet.classes.Regression.fit_general_plastic_net` with only :math:`\xi` set, for both the residual and covariance paths, against :meth:`plasticnet.classes.Regression.fit_hard_plastic_net`, checking that :math:`\zeta` is not materialized."""
+
+    X, y = regression_data(N, D, D // 10)
+
     lambda_total = np.random.exponential()
     alpha = np.random.rand()
+    xi = np.random.randn(D)
+
+    lm_hard = Regression(X, y)
+    lm_hard.xi = xi
+    lm_hard.fit_hard_plastic_net(
+        lambda_total=lambda_total, alpha=alpha, tol=tol, max_iter=max_iter
+    )
+
+    lm_pnet = Regression(X, y)
+    lm_pnet.xi = xi
+    lm_pnet.fit_general_plastic_net(
+        lambda_total=lambda_total, alpha=alpha, tol=tol, max_iter=max_iter
+    )
+
+    assert lm_pnet._zeta is None
+    np.testing.assert_almost_equal(lm_hard.beta, lm_pnet.beta, decimal=8)
+
+
+def test_elastic_net_explicit(N=500, D=1000, tol=1e-12, max_iter=10000):
+    r"""Test explicitly coded special case elastic net numba code in :meth:`plasticnet.classes.Regression.fit_elastic_net` against sklearn elastic net."""
+
+    X, y = regression_data(N, D, N // 10)
+
+    lambda_total = lambda_max(X, y) * np.random.rand()
+    alpha = np.random.rand()
 
     lm = linear_model.ElasticNet(
         alpha=lambda_total, l1_ratio=alpha, tol=tol, max_iter=max_iter
@@ -109,12 +443,9 @@ def test_elastic_net_explicit(N=500, D=1000, tol=1e-12, max_iter=10000):
 def test_general_plastic_net(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test :meth:`plasticnet.classes.Regression.fit_general_plastic_net` with :math:`\xi=0` and :math:`\zeta=0` against sklearn elastic net."""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N // 10)
 
-    lambda_total = np.random.exponential()
+    lambda_total = lambda_max(X, y) * np.random.rand()
     alpha = np.random.rand()
     xi = np.zeros(D, dtype=np.float64)
     zeta = np.zeros(D, dtype=np.float64)
@@ -137,10 +468,7 @@ def test_general_plastic_net(N=500, D=1000, tol=1e-12, max_iter=10000):
 def test_plastic_ridge_trivial(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test plastic ridge(:math:`\zeta=0` in :meth:`plasticnet.classes.Regression.fit_plastic_ridge`) against sklearn ElasticNet."""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N // 10)
 
     lambda_total = np.random.exponential()
     zeta = np.zeros(D, dtype=np.float64)
@@ -159,10 +487,7 @@ def test_plastic_ridge_trivial(N=500, D=1000, tol=1e-12, max_iter=10000):
 def test_plastic_ridge_real(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test :meth:`plasticnet.classes.Regression.fit_plastic_ridge` against sklearn ElasticNet with transformed variables."""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N // 10)
 
     lambda_total = np.random.exponential()
     zeta = np.random.randn(D).astype(np.float64)
@@ -188,12 +513,9 @@ def test_plastic_ridge_real(N=500, D=1000, tol=1e-12, max_iter=10000):
 def test_plastic_lasso_trivial(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test plastic lasso (:math:`\xi=0` in :meth:`plasticnet.classes.Regression.fit_plastic_lasso`) against sklearn ElasticNet."""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N // 10)
 
-    lambda_total = np.random.exponential()
+    lambda_total = lambda_max(X, y) * np.random.rand()
     xi = np.zeros(D, dtype=np.float64)
 
     lm = linear_model.ElasticNet(
@@ -209,15 +531,50 @@ def test_plastic_lasso_trivial(N=500, D=1000, tol=1e-12, max_iter=10000):
     np.testing.assert_almost_equal(beta_lm, lm_pnet.beta, decimal=4)
 
 
+def test_plastic_lasso_unset_xi(N=500, D=1000, tol=1e-12, max_iter=10000):
+    r"""Test that :meth:`plasticnet.classes.Regression.fit_plastic_lasso` with an unset :math:`\xi` matches sklearn ElasticNet without allocating :math:`\xi`."""
+
+    X, y = regression_data(N, D, N // 10)
+
+    lambda_total = lambda_max(X, y) * np.random.rand()
+
+    lm = linear_model.ElasticNet(
+        alpha=lambda_total, l1_ratio=1, tol=tol, max_iter=max_iter
+    )
+    lm.fit(X, y)
+    beta_lm = lm.coef_
+
+    lm_pnet = Regression(X, y)
+    lm_pnet.fit_plastic_lasso(lambda_total=lambda_total, tol=tol, max_iter=max_iter)
+
+    assert lm_pnet._xi is None
+    np.testing.assert_almost_equal(beta_lm, lm_pnet.beta, decimal=4)
+    np.testing.assert_array_equal(lm_pnet.xi, np.zeros(D))
+
+
+def test_set_targets_shape(N=200, D=100):
+    r"""Test that the xi and zeta properties reject values that do not have shape (D,), and can be reset to unset with ``None``"""
+
+    X, y = regression_data(N, D, D // 10)
+
+    lm_pnet = Regression(X, y)
+    for name in ["xi", "zeta"]:
+        for value in [0.5, np.random.randn(D + 1), np.random.randn(D, 1)]:
+            with pytest.raises(ValueError):
+                setattr(lm_pnet, name, value)
+        assert getattr(lm_pnet, "_" + name) is None
+
+        setattr(lm_pnet, name, np.random.randn(D))
+        setattr(lm_pnet, name, None)
+        assert getattr(lm_pnet, "_" + name) is None
+
+
 def test_plastic_lasso_real(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test :meth:`plasticnet.classes.Regression.fit_plastic_lasso` against sklearn ElasticNet with transformed variables."""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N // 10)
 
-    lambda_total = np.random.exponential()
+    lambda_total = lambda_max(X, y) * np.random.rand()
     xi = np.random.randn(D).astype(np.float64)
 
     X_prime = X
@@ -239,12 +596,9 @@ def test_plastic_lasso_real(N=500, D=1000, tol=1e-12, max_iter=10000):
 def test_hard_plastic_net_trivial(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test hard plastic net (:math:`\xi=0` and in :meth:`plasticnet.classes.Regression.fit_hard_plastic_net`) against sklearn ElasticNet."""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N // 10)
 
-    lambda_total = np.random.exponential()
+    lambda_total = lambda_max(X, y) * np.random.rand()
     alpha = np.random.rand()
     xi = np.zeros(D, dtype=np.float64)
 
@@ -266,12 +620,9 @@ def test_hard_plastic_net_trivial(N=500, D=1000, tol=1e-12, max_iter=10000):
 def test_hard_plastic_net_limiting_cases(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test hard plastic net :meth:`plasticnet.classes.Regression.fit_hard_plastic_net` against sklearn ElasticNet in limiting cases."""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N // 10)
 
-    lambda_total = np.random.exponential()
+    lambda_total = lambda_max(X, y) * np.random.rand()
     xi = np.random.randn(D).astype(np.float64)
 
     X_prime = X
@@ -316,12 +667,9 @@ def test_hard_plastic_net_limiting_cases(N=500, D=1000, tol=1e-12, max_iter=1000
 def test_soft_plastic_net_trivial(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test soft plastic net (:math:`\zeta=0` in :meth:`plasticnet.classes.Regression.fit_soft_plastic_net`) against sklearn ElasticNet."""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N // 10)
 
-    lambda_total = np.random.exponential()
+    lambda_total = lambda_max(X, y) * np.random.rand()
     alpha = np.random.rand()
     zeta = np.zeros(D, dtype=np.float64)
 
@@ -343,12 +691,9 @@ def test_soft_plastic_net_trivial(N=500, D=1000, tol=1e-12, max_iter=10000):
 def test_soft_plastic_net_limiting_cases(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test :meth:`plasticnet.classes.Regression.fit_soft_plastic_net` against sklearn ElasticNet in limiting cases."""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N // 10)
 
-    lambda_total = np.random.exponential()
+    lambda_total = lambda_max(X, y) * np.random.rand()
     zeta = np.random.randn(D).astype(np.float64)
 
     alpha = 1.0
@@ -393,12 +738,9 @@ def test_soft_plastic_net_limiting_cases(N=500, D=1000, tol=1e-12, max_iter=1000
 def test_unified_plastic_net_trivial(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test unified plastic net (:math:`\xi=0` in :meth:`plasticnet.classes.Regression.fit_unified_plastic_net`) against sklearn ElasticNet."""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N // 10)
 
-    lambda_total = np.random.exponential()
+    lambda_total = lambda_max(X, y) * np.random.rand()
     alpha = np.random.rand()
     xi = np.zeros(D, dtype=np.float64)
 
@@ -420,12 +762,9 @@ def test_unified_plastic_net_trivial(N=500, D=1000, tol=1e-12, max_iter=10000):
 def test_unified_plastic_net_real(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test :meth:`plasticnet.classes.Regression.fit_unified_plastic_net` against sklearn ElasticNet with transformed variables."""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N // 10)
 
-    lambda_total = np.random.exponential()
+    lambda_total = lambda_max(X, y) * np.random.rand()
     alpha = np.random.rand()
     xi = np.random.randn(D).astype(np.float64)
 
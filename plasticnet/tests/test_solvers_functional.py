@@ -1,8 +1,7 @@
 import numpy as np
+import pytest
 
 from sklearn import linear_model
-from sklearn.preprocessing import scale
-from sklearn.datasets import make_regression
 
 from plasticnet.solvers.functional import (
     ordinary_least_squares,
@@ -17,19 +16,37 @@ from plasticnet.solvers.functional import (
     unified_plastic_net,
 )
 
+from .data import lambda_max, regression_data
 
-def test_ordinary_least_squares_explicit(N=1500, D=1000, tol=1e-12, max_iter=10000):
-    r"""Test explicitly coded special case OLS numba code in :meth:`plasticnet.solvers.functional.ordinary_least_squares` against sklearn LinearRegression."""
+OLS_EQUIVALENTS = {
+    "ordinary_least_squares": ordinary_least_squares,
+    "elastic_net": lambda X, y, **kwargs: elastic_net(
+        X, y, lambda_total=0.0, alpha=0.0, **kwargs
+    ),
+    "general_plastic_net": lambda X, y, **kwargs: general_plastic_net(
+        X,
+        y,
+        np.zeros(X.shape[1]),
+        np.zeros(X.shape[1]),
+        lambda_total=0.0,
+        alpha=0.0,
+        **kwargs
+    ),
+}
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N, coef=True
-    )
-    X, y = scale(X), scale(y)
+
+@pytest.mark.parametrize(
+    "solver", list(OLS_EQUIVALENTS.values()), ids=list(OLS_EQUIVALENTS)
+)
+def test_ordinary_least_squares(solver, N=1500, D=1000, tol=1e-12, max_iter=10000):
+    r"""Test OLS, and the :math:`\lambda=0` special cases of :meth:`plasticnet.solvers.functional.elastic_net` and :meth:`plasticnet.solvers.functional.general_plastic_net`, against sklearn LinearRegression."""
+
+    X, y = regression_data(N, D, N)
 
     lm = linear_model.LinearRegression()
     lm.fit(X, y)
 
-    beta = ordinary_least_squares(X, y, tol=tol, max_iter=max_iter)
+    beta = solver(X, y, tol=tol, max_iter=max_iter)
 
     np.testing.assert_almost_equal(lm.coef_, beta, decimal=4)
 
@@ -37,10 +54,7 @@ def test_ordinary_least_squares_explicit(N=1500, D=1000, tol=1e-12, max_iter=100
 def test_ridge_explicit(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test explicitly coded special case ridge numba code in :meth:`plasticnet.solvers.functional.ridge` against sklearn elastic net with l1_ratio=0."""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N)
 
     lambda_total = np.random.exponential()
 
@@ -55,12 +69,9 @@ def test_ridge_explicit(N=500, D=1000, tol=1e-12, max_iter=10000):
 def test_lasso_explicit(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test explicitly coded special case lasso numba code in :meth:`plasticnet.solvers.functional.lasso` against sklearn elastic net with `l1_ratio=1`."""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N)
 
-    lambda_total = np.random.exponential()
+    lambda_total = lambda_max(X, y) * np.random.rand()
 
     lm = linear_model.ElasticNet(
         alpha=lambda_total, l1_ratio=1.0, tol=tol, max_iter=max_iter
@@ -72,33 +83,12 @@ def test_lasso_explicit(N=500, D=1000, tol=1e-12, max_iter=10000):
     np.testing.assert_almost_equal(beta, lm.coef_, decimal=4)
 
 
-def test_elastic_net_explicit_ordinary_least_squares(
-    N=1500, D=1000, tol=1e-12, max_iter=10000
-):
-    r"""Test explicitly coded special case elastic net with :math:`\lambda=0` in :meth:`plasticnet.solvers.functional.elastic_net` against sklearn LinearRegression."""
-
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N, coef=True
-    )
-    X, y = scale(X), scale(y)
-
-    lm = linear_model.LinearRegression()
-    lm.fit(X, y)
-
-    beta = elastic_net(X, y, lambda_total=0.0, alpha=0.0, tol=tol, max_iter=max_iter)
-
-    np.testing.assert_almost_equal(lm.coef_, beta, decimal=4)
-
-
 def test_elastic_net_explicit(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test explicitly coded elastic net in :meth:`plasticnet.solvers.functional.elastic_net` against sklearn ElasticNet."""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N // 10)
 
-    lambda_total = np.random.exponential()
+    lambda_total = lambda_max(X, y) * np.random.rand()
     alpha = np.random.rand()
 
     elastic_net_lm = linear_model.ElasticNet(
@@ -113,84 +103,40 @@ def test_elastic_net_explicit(N=500, D=1000, tol=1e-12, max_iter=10000):
     np.testing.assert_almost_equal(elastic_net_lm.coef_, beta, decimal=4)
 
 
-def test_ordinary_least_squares_general(N=1500, D=1000, tol=1e-12, max_iter=10000):
-    r"""Test OLS (:math:`\lambda=0` in :meth:`plasticnet.solvers.functional.general_plastic_net`) against sklearn LinearRegression."""
-
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
-
-    lambda_total = 0.0
-    alpha = 0.0
-    xi = np.zeros(D, dtype=np.float64)
-    zeta = np.zeros(D, dtype=np.float64)
-
-    lm = linear_model.LinearRegression()
-    lm.fit(X, y)
-
-    beta = general_plastic_net(
-        X,
-        y,
-        xi,
-        zeta,
-        lambda_total=lambda_total,
-        alpha=alpha,
-        tol=tol,
-        max_iter=max_iter,
-    )
-
-    np.testing.assert_almost_equal(lm.coef_, beta, decimal=4)
-
-
-def test_elastic_net_general(N=500, D=1000, tol=1e-12, max_iter=10000):
-    r"""Test elastic net (:math:`\xi=0` and :math:`\zeta=0` in :meth:`plasticnet.solvers.functional.general_plastic_net`) against sklearn ElasticNet."""
-
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
-
-    lambda_total = np.random.exponential()
-    alpha = np.random.rand()
-    xi = np.zeros(D, dtype=np.float64)
-    zeta = np.zeros(D, dtype=np.float64)
-
-    lm = linear_model.ElasticNet(
-        alpha=lambda_total, l1_ratio=alpha, tol=tol, max_iter=max_iter
-    )
-    lm.fit(X, y)
-
-    beta = general_plastic_net(
-        X,
-        y,
-        xi,
-        zeta,
-        lambda_total=lambda_total,
-        alpha=alpha,
-        tol=tol,
-        max_iter=max_iter,
-    )
-
-    np.testing.assert_almost_equal(lm.coef_, beta, decimal=4)
-
+@pytest.mark.parametrize(
+    "solver, n_targets, fixed_alpha",
+    [
+        (general_plastic_net, 2, None),
+        (plastic_ridge, 1, 0.0),
+        (plastic_lasso, 1, 1.0),
+        (hard_plastic_net, 1, None),
+        (soft_plastic_net, 1, None),
+        (unified_plastic_net, 1, None),
+    ],
+    ids=lambda param: getattr(param, "__name__", None),
+)
+def test_zero_targets(
+    solver, n_targets, fixed_alpha, N=500, D=1000, tol=1e-12, max_iter=10000
+):
+    r"""Test the plastic solvers with :math:`\xi=0` and :math:`\zeta=0` against sklearn ElasticNet (or Ridge, for :math:`\alpha=0`)."""
 
-def test_plastic_ridge_trivial(N=500, D=1000, tol=1e-12, max_iter=10000):
-    r"""Test plastic ridge(:math:`\zeta=0` in :meth:`plasticnet.solvers.functional.plastic_ridge`) against sklearn ElasticNet."""
+    X, y = regression_data(N, D, N // 10)
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
-
-    lambda_total = np.random.exponential()
-    zeta = np.zeros(D, dtype=np.float64)
+    lambda_total = lambda_max(X, y) * np.random.rand()
+    alpha = np.random.rand() if fixed_alpha is None else fixed_alpha
+    targets = [np.zeros(D, dtype=np.float64)] * n_targets
+    kwargs = {"alpha": alpha} if fixed_alpha is None else {}
 
-    lm = linear_model.Ridge(alpha=lambda_total * N, tol=tol, max_iter=max_iter)
+    if alpha == 0.0:
+        lm = linear_model.Ridge(alpha=lambda_total * N, tol=tol, max_iter=max_iter)
+    else:
+        lm = linear_model.ElasticNet(
+            alpha=lambda_total, l1_ratio=alpha, tol=tol, max_iter=max_iter
+        )
     lm.fit(X, y)
 
-    beta = plastic_ridge(
-        X, y, zeta, lambda_total=lambda_total, tol=tol, max_iter=max_iter
+    beta = solver(
+        X, y, *targets, lambda_total=lambda_total, tol=tol, max_iter=max_iter, **kwargs
     )
 
     np.testing.assert_almost_equal(lm.coef_, beta, decimal=4)
@@ -199,10 +145,7 @@ def test_plastic_ridge_trivial(N=500, D=1000, tol=1e-12, max_iter=10000):
 def test_plastic_ridge_real(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test :meth:`plasticnet.solvers.functional.plastic_ridge` against sklearn ElasticNet with transformed variables."""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N // 10)
 
     lambda_total = np.random.exponential()
     zeta = np.random.randn(D).astype(np.float64)
@@ -221,38 +164,12 @@ def test_plastic_ridge_real(N=500, D=1000, tol=1e-12, max_iter=10000):
     np.testing.assert_almost_equal(beta_lm, beta, decimal=4)
 
 
-def test_plastic_lasso_trivial(N=500, D=1000, tol=1e-12, max_iter=10000):
-    r"""Test plastic lasso (:math:`\xi=0` in :meth:`plasticnet.solvers.functional.plastic_lasso`) against sklearn ElasticNet."""
-
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
-
-    lambda_total = np.random.exponential()
-    xi = np.zeros(D, dtype=np.float64)
-
-    lm = linear_model.ElasticNet(
-        alpha=lambda_total, l1_ratio=1, tol=tol, max_iter=max_iter
-    )
-    lm.fit(X, y)
-
-    beta = plastic_lasso(
-        X, y, xi, lambda_total=lambda_total, tol=tol, max_iter=max_iter
-    )
-
-    np.testing.assert_almost_equal(lm.coef_, beta, decimal=4)
-
-
 def test_plastic_lasso_real(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test :meth:`plasticnet.solvers.functional.plastic_lasso` against sklearn ElasticNet with transformed variables."""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N // 10)
 
-    lambda_total = np.random.exponential()
+    lambda_total = lambda_max(X, y) * np.random.rand()
     xi = np.random.randn(D).astype(np.float64)
 
     X_prime = X
@@ -271,39 +188,12 @@ def test_plastic_lasso_real(N=500, D=1000, tol=1e-12, max_iter=10000):
     np.testing.assert_almost_equal(beta_lm, beta, decimal=4)
 
 
-def test_hard_plastic_net_trivial(N=500, D=1000, tol=1e-12, max_iter=10000):
-    r"""Test hard plastic net (:math:`\xi=0` and in :meth:`plasticnet.solvers.functional.hard_plastic_net`) against sklearn ElasticNet."""
-
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
-
-    lambda_total = np.random.exponential()
-    alpha = np.random.rand()
-    xi = np.zeros(D, dtype=np.float64)
-
-    lm = linear_model.ElasticNet(
-        alpha=lambda_total, l1_ratio=alpha, tol=tol, max_iter=max_iter
-    )
-    lm.fit(X, y)
-
-    beta = hard_plastic_net(
-        X, y, xi, lambda_total=lambda_total, alpha=alpha, tol=tol, max_iter=max_iter
-    )
-
-    np.testing.assert_almost_equal(lm.coef_, beta, decimal=4)
-
-
 def test_hard_plastic_net_limiting_cases(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test hard plastic net :meth:`plasticnet.solvers.functional.hard_plastic_net` against sklearn ElasticNet in limiting cases."""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N // 10)
 
-    lambda_total = np.random.exponential()
+    lambda_total = lambda_max(X, y) * np.random.rand()
     xi = np.random.randn(D).astype(np.float64)
 
     X_prime = X
@@ -337,39 +227,12 @@ def test_hard_plastic_net_limiting_cases(N=500, D=1000, tol=1e-12, max_iter=1000
     np.testing.assert_almost_equal(beta_lm, beta, decimal=4)
 
 
-def test_soft_plastic_net_trivial(N=500, D=1000, tol=1e-12, max_iter=10000):
-    r"""Test soft plastic net (:math:`\zeta=0` in :meth:`plasticnet.solvers.functional.soft_plastic_net`) against sklearn ElasticNet."""
-
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
-
-    lambda_total = np.random.exponential()
-    alpha = np.random.rand()
-    zeta = np.zeros(D, dtype=np.float64)
-
-    lm = linear_model.ElasticNet(
-        alpha=lambda_total, l1_ratio=alpha, tol=tol, max_iter=max_iter
-    )
-    lm.fit(X, y)
-
-    beta = soft_plastic_net(
-        X, y, zeta, lambda_total=lambda_total, alpha=alpha, tol=tol, max_iter=max_iter
-    )
-
-    np.testing.assert_almost_equal(lm.coef_, beta, decimal=4)
-
-
 def test_soft_plastic_net_limiting_cases(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test :meth:`plasticnet.solvers.functional.soft_plastic_net` against sklearn ElasticNet in limiting cases."""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N // 10)
 
-    lambda_total = np.random.exponential()
+    lambda_total = lambda_max(X, y) * np.random.rand()
     zeta = np.random.randn(D).astype(np.float64)
 
     alpha = 1.0
@@ -403,39 +266,12 @@ def test_soft_plastic_net_limiting_cases(N=500, D=1000, tol=1e-12, max_iter=1000
     np.testing.assert_almost_equal(beta_lm, beta, decimal=4)
 
 
-def test_unified_plastic_net_trivial(N=500, D=1000, tol=1e-12, max_iter=10000):
-    r"""Test unified plastic net (:math:`\xi=0` in :meth:`plasticnet.solvers.functional.unified_plastic_net`) against sklearn ElasticNet."""
-
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
-
-    lambda_total = np.random.exponential()
-    alpha = np.random.rand()
-    xi = np.zeros(D, dtype=np.float64)
-
-    lm = linear_model.ElasticNet(
-        alpha=lambda_total, l1_ratio=alpha, tol=tol, max_iter=max_iter
-    )
-    lm.fit(X, y)
-
-    beta = unified_plastic_net(
-        X, y, xi, lambda_total=lambda_total, alpha=alpha, tol=tol, max_iter=max_iter
-    )
-
-    np.testing.assert_almost_equal(lm.coef_, beta, decimal=4)
-
-
 def test_unified_plastic_net_real(N=500, D=1000, tol=1e-12, max_iter=10000):
     r"""Test :meth:`plasticnet.solvers.functional.unified_plastic_net` against sklearn ElasticNet with transformed variables."""
 
-    X, y, beta_true = make_regression(
-        n_samples=N, n_features=D, n_informative=N // 10, coef=True
-    )
-    X, y = scale(X), scale(y)
+    X, y = regression_data(N, D, N // 10)
 
-    lambda_total = np.random.exponential()
+    lambda_total = lambda_max(X, y) * np.random.rand()
     alpha = np.random.rand()
     xi = np.random.randn(D).astype(np.float64)
 
@@ -22,6 +22,7 @@ def soft_thresh(lam, x):  # pragma: no cover
             \end{cases}
 
     where :math:`\lambda` is a scalar tresholding parameter.
+    It is evaluated branchlessly as :math:`\mathrm{copysign}(\max(|x| - \lambda, 0), x)`, since which case applies depends on the data and cannot be predicted.
 
     Args:
         lam (float): threshold value
@@ -30,7 +31,4 @@ def soft_thresh(lam, x):  # pragma: no cover
     Returns:
         numpy.ndarray: soft thresholded array of floats
     """
-    if lam == 0.0:
-        return x
-    else:
-        return np.sign(x) * np.maximum(np.abs(x) - lam, 0)
+    return np.copysign(np.maximum(np.abs(x) - lam, 0.0), x)